@@ -1,6 +1,12 @@
-from flask import Flask, jsonify
+from flask import Flask, Response, jsonify
 from flask_cors import CORS
 import backend.classes.aiven as aiven
+from backend.classes.cache import DEFAULT_TTL, init_reference_cache
+from backend.classes.compression import init_compression
+from backend.classes.conditional import init_conditional_requests
+from backend.classes.instrumentation import init_instrumentation
+from backend.classes.json_provider import init_json_provider
+from backend.classes.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, init_metrics
 from sqlalchemy import select
 from backend.routes.products import init_routes as init_products
 from backend.routes.adresse import init_routes as init_adresse
@@ -17,69 +23,151 @@ from backend.routes.wichtigkeit import init_routes as init_wichtigkeit
 from backend.routes.auftrag import init_routes as init_auftrag
 from backend.routes.auftragsposition import init_routes as init_auftragsposition
 
-app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
-
-# Initialize database connection
-aiven_env = aiven.AivenEnvironment()
-db = aiven.AivenDatabase(aiven_env)
-db.connect()
-
-# Register blueprints
-app.register_blueprint(init_products(db))
-app.register_blueprint(init_adresse(db))
-app.register_blueprint(init_person(db))
-app.register_blueprint(init_unternehmen(db))
-app.register_blueprint(init_kontakt(db))
-app.register_blueprint(init_terminart(db))
-app.register_blueprint(init_termine(db))
-app.register_blueprint(init_protokoll(db))
-app.register_blueprint(init_teilnehmer(db))
-app.register_blueprint(init_medium(db))
-app.register_blueprint(init_anhang(db))
-app.register_blueprint(init_wichtigkeit(db))
-app.register_blueprint(init_auftrag(db))
-app.register_blueprint(init_auftragsposition(db))
-
-
-@app.route('/')
-def home():
-    """Home endpoint"""
-    return jsonify({
-        "message": "Welcome to mobsys-backend-api",
-        "version": "0.1.0",
-        "endpoints": {
-            "/": "Home",
-            "/health": "Health check",
-            "/api/products": "Products API",
-            "/api/adresse": "Addresses API",
-            "/api/person": "Persons API",
-            "/api/unternehmen": "Companies API",
-            "/api/kontakt": "Contacts API",
-            "/api/terminart": "Appointment Types API",
-            "/api/termine": "Appointments API",
-            "/api/protokoll": "Protocols API",
-            "/api/teilnehmer": "Participants API",
-            "/api/medium": "Media API",
-            "/api/anhang": "Attachments API",
-            "/api/wichtigkeit": "Importance Levels API",
-            "/api/auftrag": "Orders API",
-            "/api/auftragsposition": "Order Items API"
-        }
-    })
-
-
-@app.route('/health')
-def health():
-    """Health check endpoint"""
-    try:
-        # Test database connection
-        with db.session as session:
-            session.execute(select(1))
-        return jsonify({"status": "healthy", "database": "connected"}), 200
-    except Exception as e:
-        return jsonify({"status": "unhealthy", "error": str(e)}), 503
+DEFAULT_CONFIG = {
+    # sqlalchemy engine to use instead of the Aiven database (e.g. SQLite for tests)
+    'DATABASE_ENGINE': None,
+    # async engine and sessions per greenlet, set by backend.asgi (DATABASE_ENGINE is then an AsyncEngine)
+    'ASYNC_DATABASE': False,
+    # seconds the rows of the lookup tables are served from memory (see cache.py)
+    'REFERENCE_CACHE_TTL': DEFAULT_TTL,
+    # Server-Timing / X-Query-Count headers and per endpoint statistics (GET /stats)
+    'REQUEST_TIMING': True,
+    # Prometheus metrics (GET /metrics)
+    'METRICS': True,
+    # JSON encoder: 'auto' (orjson if installed), 'orjson' or 'json'
+    'JSON_PROVIDER': 'auto',
+    # Decimal values (prices) as 'float' or exact 'string'
+    'JSON_DECIMAL': 'float',
+    # gzip/br/zstd compression negotiated with Accept-Encoding
+    'COMPRESSION': True,
+    'COMPRESSION_MIN_SIZE': 1024,
+    # level per encoding and order of preference, None for the defaults of compression.py
+    'COMPRESSION_LEVELS': None,
+    'COMPRESSION_ENCODINGS': None,
+}
+
+
+def create_app(config: dict = None) -> Flask:
+    """
+    Create the Flask application.
+
+    Nothing is connected here: the .env file is read and the engine is created
+    on the first database access.
+
+    Args:
+        config: Flask config values, e.g. {"DATABASE_ENGINE": engine, "TESTING": True}
+
+    Returns:
+        Flask: the application
+    """
+    app = Flask(__name__)
+    app.config.update(DEFAULT_CONFIG)
+    app.config.update(config or {})
+    CORS(app)  # Enable CORS for all routes
+    init_json_provider(app)  # orjson if installed, ISO 8601 dates, decimals as configured
+
+    # Initialize database (connects lazily)
+    db = aiven.AivenDatabase(engine=app.config['DATABASE_ENGINE'], asynchronous=app.config['ASYNC_DATABASE'])
+    app.extensions['aiven_db'] = db
+    reference_cache = init_reference_cache(app, db)
+
+    # after_request hooks run in reverse order of registration: the metrics see
+    # the final response (304, compressed) and time the ETag and compression too
+    metrics = init_metrics(app, db, reference_cache) if app.config['METRICS'] else None
+    if app.config['COMPRESSION']:
+        init_compression(app)  # registered before the ETag hook so it runs after the ETag is computed
+    init_conditional_requests(app)  # ETag / 304 handling for GET requests
+    endpoint_stats = init_instrumentation(app, db) if app.config['REQUEST_TIMING'] else None
+
+    @app.teardown_appcontext
+    def remove_session(exception=None):
+        """Release the session of the finished request back to the pool"""
+        db.remove_session(exception)
+
+    # Register blueprints
+    app.register_blueprint(init_products(db))
+    app.register_blueprint(init_adresse(db))
+    app.register_blueprint(init_person(db))
+    app.register_blueprint(init_unternehmen(db))
+    app.register_blueprint(init_kontakt(db))
+    app.register_blueprint(init_terminart(db))
+    app.register_blueprint(init_termine(db))
+    app.register_blueprint(init_protokoll(db))
+    app.register_blueprint(init_teilnehmer(db))
+    app.register_blueprint(init_medium(db))
+    app.register_blueprint(init_anhang(db))
+    app.register_blueprint(init_wichtigkeit(db))
+    app.register_blueprint(init_auftrag(db))
+    app.register_blueprint(init_auftragsposition(db))
+
+    @app.route('/')
+    def home():
+        """Home endpoint"""
+        return jsonify({
+            "message": "Welcome to mobsys-backend-api",
+            "version": "0.1.0",
+            "endpoints": {
+                "/": "Home",
+                "/health": "Health check",
+                "/stats": "Request statistics per endpoint",
+                "/metrics": "Prometheus metrics",
+                "/api/products": "Products API",
+                "/api/adresse": "Addresses API",
+                "/api/person": "Persons API",
+                "/api/unternehmen": "Companies API",
+                "/api/kontakt": "Contacts API",
+                "/api/terminart": "Appointment Types API",
+                "/api/termine": "Appointments API",
+                "/api/protokoll": "Protocols API",
+                "/api/teilnehmer": "Participants API",
+                "/api/medium": "Media API",
+                "/api/anhang": "Attachments API",
+                "/api/wichtigkeit": "Importance Levels API",
+                "/api/auftrag": "Orders API",
+                "/api/auftragsposition": "Order Items API"
+            }
+        })
+
+    @app.route('/health')
+    def health():
+        """Health check endpoint"""
+        try:
+            # Test database connection
+            with db.session as session:
+                session.execute(select(1))
+            return jsonify({"status": "healthy", "database": "connected", "cache": reference_cache.stats()}), 200
+        except Exception as e:
+            return jsonify({"status": "unhealthy", "error": str(e)}), 503
+
+    @app.route('/stats')
+    def stats():
+        """Request statistics per endpoint"""
+        if endpoint_stats is None:
+            return jsonify({"error": "Request timing is disabled"}), 404
+        return jsonify(endpoint_stats.snapshot()), 200
+
+    @app.route('/metrics')
+    def prometheus_metrics():
+        """Prometheus metrics"""
+        if metrics is None:
+            return jsonify({"error": "Metrics are disabled"}), 404
+        return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+    return app
+
+
+_app = None
+
+
+def __getattr__(name):
+    """Create the module level `app` (backend.app:app) on first access."""
+    global _app
+    if name == 'app':
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    create_app().run(debug=True, host='0.0.0.0', port=5000)
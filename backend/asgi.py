@@ -0,0 +1,163 @@
+'''
+ASGI serving of the API with an async database engine.
+
+Usage:
+    python main.py serve --server uvicorn [--url sqlite+aiosqlite:///local.db]
+    uvicorn backend.asgi:app
+
+The routes are the ones of the WSGI application (backend/app.py); they are
+not duplicated. Every request runs in its own greenlet on the event loop
+(sqlalchemy.util.greenlet_spawn). The session of the request is bound to an
+async engine (create_async_engine), so each statement suspends the request
+until the database answers and the event loop serves other requests in the
+meantime. One process overlaps as many database round trips as its pool has
+connections, instead of one per worker thread.
+
+Serialization and compression still run on the event loop thread: CPU bound
+work is not parallelized, only the waits for the database are overlapped.
+
+Requires the extra "async" (greenlet, aiomysql, aiosqlite, uvicorn).
+'''
+
+import io
+import sys
+
+from sqlalchemy.util import await_only, greenlet_spawn
+
+from backend.app import create_app
+
+
+def build_environ(scope: dict, body: bytes) -> dict:
+    """WSGI environ of an ASGI HTTP request."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        # WSGI strings are bytes decoded as latin-1
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': False,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope['headers']:
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif name != 'CONTENT_LENGTH':
+            key = f'HTTP_{name}'
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+class AsgiApplication:
+    """ASGI application running a WSGI application with an asynchronous database."""
+
+    def __init__(self, wsgi_app, db):
+        """
+        Args:
+            wsgi_app: Flask application created with ASYNC_DATABASE
+            db: its AivenDatabase
+        """
+        self.wsgi_app = wsgi_app
+        self.db = db
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http':
+            body = await self.read_body(receive)
+            if body is not None:
+                await greenlet_spawn(self.handle, build_environ(scope, body), send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.db.engine is not None:
+                    # Closing the pooled connections awaits the driver as well
+                    await greenlet_spawn(self.db.engine.dispose)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    async def read_body(receive):
+        """Request body, None if the client disconnected."""
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body', False):
+                return b''.join(chunks)
+
+    def handle(self, environ: dict, send):
+        """Run the WSGI application in the greenlet of the request and send its response."""
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [(name.encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+
+        def send_start():
+            await_only(send({'type': 'http.response.start', 'status': response['status'],
+                             'headers': response['headers']}))
+
+        chunks = self.wsgi_app(environ, start_response)
+        try:
+            started = False
+            # Streamed responses read the database while they are sent
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                if not started:
+                    send_start()
+                    started = True
+                await_only(send({'type': 'http.response.body', 'body': chunk, 'more_body': True}))
+            if not started:
+                send_start()
+            await_only(send({'type': 'http.response.body', 'body': b''}))
+        finally:
+            # Runs the teardown of the request, which returns the connection to the pool
+            if hasattr(chunks, 'close'):
+                chunks.close()
+
+
+def create_asgi_app(config: dict = None) -> AsgiApplication:
+    """
+    Create the ASGI application.
+
+    Args:
+        config: Flask config values as for create_app; DATABASE_ENGINE must be an
+            AsyncEngine, e.g. create_async_engine("sqlite+aiosqlite:///local.db")
+    """
+    app = create_app({**(config or {}), 'ASYNC_DATABASE': True})
+    return AsgiApplication(app, app.extensions['aiven_db'])
+
+
+_app = None
+
+
+def __getattr__(name):
+    """Create the module level `app` (backend.asgi:app) on first access."""
+    global _app
+    if name == 'app':
+        if _app is None:
+            _app = create_asgi_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
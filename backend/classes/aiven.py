@@ -8,8 +8,11 @@ Usage:
 
 import os
 import sys
+import threading
 try:
     import sqlalchemy
+    import sqlalchemy.orm
+    from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
     SQLALCHEMY_AVAILABLE = True
     from dotenv import load_dotenv
 except ImportError:
@@ -41,6 +44,13 @@ class AivenEnvironment:
         env_variables['AIVEN_PASSWORD'] = os.getenv('AIVEN_PASSWORD')
         env_variables['AIVEN_CERT_PATH'] = os.getenv('AIVEN_CERT_PATH')
 
+        # Optional connection pool settings (defaults are used if not set)
+        env_variables['AIVEN_POOL_SIZE'] = os.getenv('AIVEN_POOL_SIZE')
+        env_variables['AIVEN_POOL_MAX_OVERFLOW'] = os.getenv('AIVEN_POOL_MAX_OVERFLOW')
+        env_variables['AIVEN_POOL_TIMEOUT'] = os.getenv('AIVEN_POOL_TIMEOUT')
+        env_variables['AIVEN_POOL_RECYCLE'] = os.getenv('AIVEN_POOL_RECYCLE')
+        env_variables['AIVEN_POOL_PRE_PING'] = os.getenv('AIVEN_POOL_PRE_PING')
+
         return env_variables
 
 
@@ -103,17 +113,83 @@ class AivenEnvironment:
     def get_cert_path(self) -> str:
         """Get the Aiven certificate path."""
         return self.env_variables.get('AIVEN_CERT_PATH')
+
+    def get_pool_size(self) -> int:
+        """Get the number of connections kept open in the pool."""
+        return int(self.env_variables.get('AIVEN_POOL_SIZE') or 5)
+
+    def get_pool_max_overflow(self) -> int:
+        """Get the number of connections allowed on top of the pool size."""
+        return int(self.env_variables.get('AIVEN_POOL_MAX_OVERFLOW') or 10)
+
+    def get_pool_timeout(self) -> int:
+        """Get the seconds to wait for a free connection before giving up."""
+        return int(self.env_variables.get('AIVEN_POOL_TIMEOUT') or 30)
+
+    def get_pool_recycle(self) -> int:
+        """Get the seconds after which pooled connections are replaced (below the server idle timeout)."""
+        return int(self.env_variables.get('AIVEN_POOL_RECYCLE') or 1800)
+
+    def get_pool_pre_ping(self) -> bool:
+        """Get whether pooled connections are tested before they are handed out."""
+        value = self.env_variables.get('AIVEN_POOL_PRE_PING')
+        if value is None:
+            return True
+        return value.strip().lower() not in ('0', 'false', 'no', 'off')
     
 
 class AivenDatabase:
-    def __init__(self, env: AivenEnvironment):
+    def __init__(self, env: AivenEnvironment = None, engine=None, asynchronous: bool = False):
+        """
+        Args:
+            env: loaded environment, read from .env on first use if None
+            engine: existing sqlalchemy engine to use instead of connecting to Aiven (e.g. SQLite for tests),
+                an AsyncEngine if asynchronous
+            asynchronous: use an async engine (see backend/asgi.py): the requests run in greenlets
+                and every greenlet gets its own session, whose statements are awaited on the event loop
+        """
+        if asynchronous and engine is not None:
+            if not isinstance(engine, AsyncEngine):
+                raise TypeError("An asynchronous database needs an AsyncEngine (create_async_engine)")
+            engine = engine.sync_engine
         self.env = env
-        self.engine = None
-        self.session = None
+        self.engine = engine
+        self.asynchronous = asynchronous
+        self.session_factory = None
+        self.scoped_session = None
+        self._connect_lock = threading.Lock()
+        self._engine_callbacks = []
+
+    @property
+    def session(self) -> sqlalchemy.orm.Session:
+        """
+        Session of the current thread (greenlet if asynchronous).
+
+        Every request (thread) gets its own session from the scoped registry,
+        so concurrent requests never share a session or a connection.
+        The engine is created on first use.
+        """
+        if self.scoped_session is None and self.connect() is None:
+            raise RuntimeError("Database connection is not available")
+        return self.scoped_session()
+
+    def remove_session(self, exception=None):
+        """Close the session of the current thread and return its connection to the pool."""
+        if self.scoped_session is not None:
+            self.scoped_session.remove()
+
+    def on_engine(self, callback):
+        """Call callback(engine) once the engine exists (immediately if it already does)."""
+        with self._connect_lock:
+            self._engine_callbacks.append(callback)
+            engine = self.engine
+        if engine is not None:
+            callback(engine)
 
     def connect(self):
         """
         Connect to Aiven database using the loaded environment variables.
+        Does nothing if already connected; an injected engine is used as is.
 
         Returns:
             connection: sqlalchemy engine object
@@ -122,17 +198,66 @@ class AivenDatabase:
             print("Error: sqlalchemy is not installed. Please install it with '(uv) pip install sqlalchemy'.")
             return None
 
+        with self._connect_lock:
+            if self.scoped_session is not None:
+                return self.engine
+            if self.engine is None:
+                engine = self._create_engine()
+                if engine is None:
+                    return None
+                self.engine = engine
+                for callback in self._engine_callbacks:
+                    callback(engine)
+            self.session_factory = sqlalchemy.orm.sessionmaker(bind=self.engine)
+            scopefunc = None
+            if self.asynchronous:
+                # Concurrent requests of the async mode share the event loop thread
+                from greenlet import getcurrent as scopefunc
+            self.scoped_session = sqlalchemy.orm.scoped_session(self.session_factory, scopefunc=scopefunc)
+            return self.engine
+
+    def _create_engine(self):
+        """Create the engine for the Aiven database from the environment (loaded now if not given)."""
         try:
+            if self.env is None:
+                self.env = AivenEnvironment()
+            if self.asynchronous:
+                return self._create_async_engine().sync_engine
             timeout = 10
-            self.engine = sqlalchemy.create_engine(
+            engine = sqlalchemy.create_engine(
                 self.env.get_service_uri(),
                 connect_args={
                     "connect_timeout": timeout,
                     'ssl_ca': self.env.get_cert_path()
-                }
+                },
+                poolclass=sqlalchemy.pool.QueuePool,
+                pool_size=self.env.get_pool_size(),
+                max_overflow=self.env.get_pool_max_overflow(),
+                pool_timeout=self.env.get_pool_timeout(),
+                pool_recycle=self.env.get_pool_recycle(),
+                pool_pre_ping=self.env.get_pool_pre_ping()
             )
             print("Successfully connected to the Aiven database using environment variables.")
-            self.session = sqlalchemy.orm.Session(self.engine)
+            return engine
         except Exception as e:
             print(f"Error connecting to the database using environment variables: {e}")
             return None
+
+    def _create_async_engine(self):
+        """Create an async engine (aiomysql driver) for the Aiven database with the pool settings of the environment."""
+        import ssl
+        url = sqlalchemy.engine.make_url(self.env.get_service_uri()).set(drivername='mysql+aiomysql')
+        engine = create_async_engine(
+            url,
+            connect_args={
+                "connect_timeout": 10,
+                'ssl': ssl.create_default_context(cafile=self.env.get_cert_path())
+            },
+            pool_size=self.env.get_pool_size(),
+            max_overflow=self.env.get_pool_max_overflow(),
+            pool_timeout=self.env.get_pool_timeout(),
+            pool_recycle=self.env.get_pool_recycle(),
+            pool_pre_ping=self.env.get_pool_pre_ping()
+        )
+        print("Successfully created the async engine for the Aiven database using environment variables.")
+        return engine
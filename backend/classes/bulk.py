@@ -0,0 +1,283 @@
+'''
+Bulk create, update and delete endpoints shared by all resources.
+
+    POST   /api/<resource>/bulk   [{...}, {...}]              create, returns the new ids
+    PUT    /api/<resource>/bulk   [{"id": 1, ...}, ...]       update the given fields
+    DELETE /api/<resource>/bulk   {"ids": [1, 2]} or [1, 2]   delete
+
+Every item is validated before anything is written. If one item is invalid
+nothing is written and the response is 400 with one entry per invalid item:
+
+    {"error": "Invalid items", "errors": [{"index": 3, "error": "Missing required fields: name"}]}
+
+Valid requests are executed in a single transaction.
+'''
+
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from flask import jsonify, request
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+
+from backend.classes.errors import constraint_error, internal_error
+
+MAX_BULK_ITEMS = 20000
+
+
+class Field:
+    """JSON key of a resource mapped to a column attribute of its table."""
+
+    def __init__(self, attribute: str, parse=None, dump=None):
+        """
+        Args:
+            attribute: column attribute of the table
+            parse: callable converting a JSON value to the column value
+            dump: callable converting a column value to its JSON value
+                (dates, datetimes and decimals are left to the JSON provider)
+        """
+        self.attribute = attribute
+        self.parse = parse
+        self.dump = dump
+
+    def load(self, value):
+        """Convert a JSON value to the value stored in the column."""
+        if value is None:
+            return value
+        if self.parse is None:
+            if isinstance(value, (dict, list)):
+                raise ValueError("expected a single value")
+            return value
+        return self.parse(value)
+
+
+def parse_int(value) -> int:
+    """Parse an integer, given as a number without fraction or as a string."""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError("expected an integer")
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError("expected an integer")
+        return int(value)
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError("expected an integer")
+
+
+def parse_decimal(value) -> Decimal:
+    """Parse a decimal number, given as a number or as a string (exact)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError("expected a number")
+    try:
+        # str() keeps the digits of a float as written in the JSON body
+        number = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError("expected a number")
+    if not number.is_finite():
+        raise ValueError("expected a number")
+    return number
+
+
+def parse_bool(value) -> bool:
+    """Parse a boolean, given as true/false or 1/0."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    raise ValueError("expected true or false")
+
+
+def parse_datetime(value):
+    """Parse an ISO 8601 datetime."""
+    return datetime.fromisoformat(value)
+
+
+def parse_date(value):
+    """Parse an ISO 8601 date (a datetime is truncated to its date)."""
+    return datetime.fromisoformat(value).date()
+
+
+class BulkError(ValueError):
+    """Raised when a bulk request contains invalid items."""
+
+    def __init__(self, errors: list):
+        super().__init__("Invalid items")
+        self.errors = errors
+
+
+def _load_items(data, max_items: int = MAX_BULK_ITEMS) -> list:
+    """Check the outer shape of a bulk request body."""
+    if not isinstance(data, list):
+        raise BulkError([{"index": None, "error": "Expected a JSON array"}])
+    if not data:
+        raise BulkError([{"index": None, "error": "No items given"}])
+    if len(data) > max_items:
+        raise BulkError([{"index": None, "error": f"At most {max_items} items are allowed per request"}])
+    return data
+
+
+def load_values(item, fields: dict, required=(), not_null=()) -> dict:
+    """
+    Convert one JSON item into column values.
+
+    Args:
+        item: JSON item
+        fields: JSON key -> Field
+        required: JSON keys the item must contain
+        not_null: JSON keys of non-nullable columns, null is rejected
+
+    Raises:
+        ValueError: with a message describing the invalid item
+    """
+    if not isinstance(item, dict):
+        raise ValueError("Item must be a JSON object")
+    missing = [key for key in required if key not in item]
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+    values = {}
+    for key, field in fields.items():
+        if key in item:
+            try:
+                if item[key] is None and key in not_null:
+                    raise ValueError("must not be null")
+                values[field.attribute] = field.load(item[key])
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Invalid value for {key}: {e}")
+    return values
+
+
+def _load_id(value) -> int:
+    """Validate a primary key given in a bulk request."""
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError("id must be an integer")
+    return value
+
+
+def _missing_ids(session, table, ids) -> set:
+    """Get the ids that do not exist in the table."""
+    found = session.execute(select(table.id).where(table.id.in_(set(ids)))).scalars().all()
+    return set(ids) - set(found)
+
+
+def init_bulk_routes(bp, db, table, fields: dict, required=(), not_null=(), after_commit=None):
+    """
+    Register the bulk endpoints of a resource on its blueprint.
+
+    Args:
+        bp: blueprint of the resource
+        db: AivenDatabase instance
+        table: mapped table class
+        fields: JSON key -> Field for every writable field
+        required: JSON keys required to create an item
+        not_null: JSON keys of non-nullable columns
+        after_commit: optional callable run after a successful write
+    """
+
+    def bulk_create():
+        """Create several items in one transaction"""
+        try:
+            items = _load_items(request.get_json(silent=True))
+            rows, errors = [], []
+            for index, item in enumerate(items):
+                try:
+                    rows.append(load_values(item, fields, required, not_null))
+                except ValueError as e:
+                    errors.append({"index": index, "error": str(e)})
+            if errors:
+                raise BulkError(errors)
+
+            with db.session as session:
+                objects = [table(**values) for values in rows]
+                # One INSERT per row, as the ORM needs each generated id in request
+                # order: MySQL has no RETURNING and SQLite's insertmanyvalues falls
+                # back to single rows for autoincrement keys. The gain over single
+                # POSTs is one request and one transaction, not fewer statements.
+                session.add_all(objects)
+                session.flush()
+                ids = [obj.id for obj in objects]
+                session.commit()
+            if after_commit:
+                after_commit()
+            return jsonify({"ids": ids, "count": len(ids)}), 201
+        except BulkError as e:
+            return jsonify({"error": str(e), "errors": e.errors}), 400
+        except IntegrityError as e:
+            return constraint_error(e)
+        except Exception as e:
+            return internal_error(e)
+
+    def bulk_update():
+        """Update several items in one transaction"""
+        try:
+            items = _load_items(request.get_json(silent=True))
+            rows, errors = [], []
+            for index, item in enumerate(items):
+                try:
+                    if not isinstance(item, dict) or 'id' not in item:
+                        raise ValueError("Missing required fields: id")
+                    values = load_values(item, fields, not_null=not_null)
+                    values['id'] = _load_id(item['id'])
+                    rows.append(values)
+                except ValueError as e:
+                    errors.append({"index": index, "error": str(e)})
+            if errors:
+                raise BulkError(errors)
+
+            with db.session as session:
+                missing = _missing_ids(session, table, [values['id'] for values in rows])
+                if missing:
+                    raise BulkError([
+                        {"index": index, "error": "Not found"}
+                        for index, values in enumerate(rows) if values['id'] in missing
+                    ])
+                # ORM bulk UPDATE by primary key, executed as executemany
+                session.execute(update(table), rows)
+                session.commit()
+            if after_commit:
+                after_commit()
+            ids = [values['id'] for values in rows]
+            return jsonify({"ids": ids, "count": len(ids)}), 200
+        except BulkError as e:
+            return jsonify({"error": str(e), "errors": e.errors}), 400
+        except IntegrityError as e:
+            return constraint_error(e)
+        except Exception as e:
+            return internal_error(e)
+
+    def bulk_delete():
+        """Delete several items in one transaction"""
+        try:
+            data = request.get_json(silent=True)
+            if isinstance(data, dict):
+                data = data.get('ids')
+            items = _load_items(data)
+            ids, errors = [], []
+            for index, item in enumerate(items):
+                try:
+                    ids.append(_load_id(item))
+                except ValueError as e:
+                    errors.append({"index": index, "error": str(e)})
+            if errors:
+                raise BulkError(errors)
+
+            with db.session as session:
+                missing = _missing_ids(session, table, ids)
+                if missing:
+                    raise BulkError([
+                        {"index": index, "error": "Not found"}
+                        for index, id_ in enumerate(ids) if id_ in missing
+                    ])
+                session.execute(delete(table).where(table.id.in_(set(ids))))
+                session.commit()
+            if after_commit:
+                after_commit()
+            return jsonify({"ids": ids, "count": len(ids)}), 200
+        except BulkError as e:
+            return jsonify({"error": str(e), "errors": e.errors}), 400
+        except Exception as e:
+            return internal_error(e)
+
+    bp.add_url_rule('/bulk', 'bulk_create', bulk_create, methods=['POST'])
+    bp.add_url_rule('/bulk', 'bulk_update', bulk_update, methods=['PUT'])
+    bp.add_url_rule('/bulk', 'bulk_delete', bulk_delete, methods=['DELETE'])
@@ -0,0 +1,108 @@
+'''
+In-process read-through cache for the small lookup tables.
+
+Terminart, Wichtigkeit, Produkt and Medium are tiny and rarely change, but
+almost every list endpoint resolves them. The first lookup loads the whole
+table with one query; later lookups are answered from memory until the TTL
+expires or a write handler invalidates the table.
+
+Usage:
+    init_reference_cache(app, db)  # in create_app
+    art = current_reference_cache().get(tables.Terminart, appointment.Art)  # art.id, art.Name
+
+Every app has its own cache (app.extensions['reference_cache']), so two apps
+in one process never serve each other's rows. The cache lives in the
+process, so with several workers a change becomes visible to the other
+workers after at most one TTL (REFERENCE_CACHE_TTL of create_app,
+DEFAULT_TTL seconds by default).
+'''
+
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import select
+
+DEFAULT_TTL = 300
+
+
+class ReferenceCache:
+
+    def __init__(self, db, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+        self.db = db
+        self._lock = threading.Lock()
+        # table -> (load time, {id: row})
+        self._entries = {}
+        # Invalidations per table and of all tables, to drop loads that overlap a write
+        self._generations = {}
+        self._cleared = 0
+        self._hits = {}
+        self._misses = {}
+
+    def get(self, table, key):
+        """
+        Get a row of a lookup table by its primary key.
+
+        Returns:
+            Row: read-only row with the table's columns as attributes, or None
+        """
+        if key is None:
+            return None
+        return self.rows(table).get(key)
+
+    def rows(self, table) -> dict:
+        """Get all rows of a lookup table as a dict keyed by primary key."""
+        name = table.__tablename__
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._hits[name] = self._hits.get(name, 0) + 1
+                return entry[1]
+            self._misses[name] = self._misses.get(name, 0) + 1
+            generation = (self._cleared, self._generations.get(name, 0))
+
+        # Plain rows instead of entities, so they can be shared between sessions and threads
+        result = self.db.session.execute(select(*table.__table__.columns))
+        rows = {row.id: row for row in result}
+        with self._lock:
+            # An invalidation during the load may have come after the rows were read
+            if (self._cleared, self._generations.get(name, 0)) == generation:
+                self._entries[name] = (time.monotonic(), rows)
+        return rows
+
+    def invalidate(self, table=None):
+        """Drop the cached rows of a table (of all tables if table is None)."""
+        with self._lock:
+            if table is None:
+                self._cleared += 1
+                self._entries.clear()
+            else:
+                name = table.__tablename__
+                self._generations[name] = self._generations.get(name, 0) + 1
+                self._entries.pop(name, None)
+
+    def stats(self) -> dict:
+        """Get hit and miss counters per table."""
+        with self._lock:
+            names = sorted(set(self._hits) | set(self._misses))
+            return {
+                name: {
+                    "hits": self._hits.get(name, 0),
+                    "misses": self._misses.get(name, 0),
+                    "cached_rows": len(self._entries[name][1]) if name in self._entries else 0
+                }
+                for name in names
+            }
+
+
+def init_reference_cache(app, db) -> ReferenceCache:
+    """Create the reference cache of an app, reading the tables through db."""
+    cache = ReferenceCache(db, ttl=app.config['REFERENCE_CACHE_TTL'])
+    app.extensions['reference_cache'] = cache
+    return cache
+
+
+def current_reference_cache() -> ReferenceCache:
+    """The reference cache of the app handling the current request."""
+    return current_app.extensions['reference_cache']
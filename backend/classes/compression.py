@@ -0,0 +1,185 @@
+'''
+Response compression negotiated with Accept-Encoding.
+
+    GET /api/teilnehmer?all=true
+    Accept-Encoding: br, gzip
+
+    Content-Encoding: br
+    Vary: Accept-Encoding
+
+The encoding is the one the client prefers (by its q-values) among the
+available ones, ties go to the order of COMPRESSION_ENCODINGS. gzip is always
+available, br and zstd with the optional packages of the extra "compress"
+(brotli, zstandard).
+
+Responses are compressed after serialization and after the ETag was computed
+(see conditional.py): the ETag of a compressed response becomes weak, so it
+still matches If-None-Match for every encoding. A 304 answering a request that
+would have been compressed carries the same weak ETag and Vary header as the
+compressed 200. Responses smaller than COMPRESSION_MIN_SIZE, types other than
+JSON, NDJSON and text, and responses supporting Range requests (e.g. the text of
+a protocol) are sent as they are: byte ranges, and the strong ETag If-Range
+needs, refer to the uncompressed body, for 200, 206 and 304 alike. Streamed responses are compressed while they
+are generated and flushed every STREAM_FLUSH_SIZE bytes of input, so clients
+keep receiving rows.
+
+Config:
+    COMPRESSION: enable compression
+    COMPRESSION_MIN_SIZE: smallest body in bytes that is compressed
+    COMPRESSION_LEVELS: level per encoding, e.g. {'gzip': 9}, defaults in DEFAULT_LEVELS
+    COMPRESSION_ENCODINGS: encodings in order of preference, default DEFAULT_ENCODINGS
+'''
+
+import importlib.util
+import zlib
+
+from flask import request
+
+DEFAULT_LEVELS = {'gzip': 6, 'br': 4, 'zstd': 3}
+DEFAULT_ENCODINGS = ('zstd', 'br', 'gzip')
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson')
+STREAM_FLUSH_SIZE = 64 * 1024
+
+
+class GzipEncoder:
+    def __init__(self, level: int):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        compressor = zlib.compressobj(self.level, wbits=31)
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self):
+        compressor = zlib.compressobj(self.level, wbits=31)
+        return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+class BrotliEncoder:
+    def __init__(self, level: int):
+        import brotli
+        self.brotli = brotli
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return self.brotli.compress(data, quality=self.level)
+
+    def stream(self):
+        compressor = self.brotli.Compressor(quality=self.level)
+        return compressor.process, compressor.flush, compressor.finish
+
+
+class ZstdEncoder:
+    def __init__(self, level: int):
+        import zstandard
+        self.zstandard = zstandard
+        self.compressor = zstandard.ZstdCompressor(level=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.compress(data)
+
+    def stream(self):
+        compressor = self.compressor.compressobj()
+        return (compressor.compress, lambda: compressor.flush(self.zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+                compressor.flush)
+
+
+# Encoding -> (encoder class, module it needs or None)
+ENCODERS = {
+    'gzip': (GzipEncoder, None),
+    'br': (BrotliEncoder, 'brotli'),
+    'zstd': (ZstdEncoder, 'zstandard'),
+}
+
+
+def available_encoders(encodings=DEFAULT_ENCODINGS, levels: dict = None) -> dict:
+    """Encoders of the encodings whose packages are installed, in the given order."""
+    levels = {**DEFAULT_LEVELS, **(levels or {})}
+    encoders = {}
+    for name in encodings:
+        if name not in ENCODERS:
+            raise ValueError(f"Unknown encoding: {name}")
+        encoder_class, module = ENCODERS[name]
+        if module is None or importlib.util.find_spec(module) is not None:
+            encoders[name] = encoder_class(levels[name])
+    return encoders
+
+
+def is_compressible(response) -> bool:
+    return response.mimetype in COMPRESSIBLE_TYPES or response.mimetype.startswith('text/')
+
+
+def weaken_etag(response):
+    """Mark the ETag weak: the compressed body differs, the content does not."""
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def compress_stream(chunks, encoder, flush_size: int = STREAM_FLUSH_SIZE):
+    """Compress the chunks of a streamed body, flushing every flush_size bytes of input."""
+    compress, flush, finish = encoder.stream()
+    pending = 0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            pending += len(chunk)
+            data = compress(chunk)
+            if pending >= flush_size:
+                data += flush()
+                pending = 0
+            if data:
+                yield data
+        yield finish()
+    finally:
+        # Ends the generator of the response (and its session) if the client disconnects
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def init_compression(app):
+    """
+    Register the compression of the responses on the app.
+
+    Must be called before init_conditional_requests, so the ETag is computed
+    from the uncompressed body (after_request functions run in reverse order).
+    """
+    encoders = available_encoders(app.config['COMPRESSION_ENCODINGS'] or DEFAULT_ENCODINGS,
+                                  app.config['COMPRESSION_LEVELS'])
+    # identity last: a client preferring uncompressed responses gets them
+    choices = [*encoders, 'identity']
+    min_size = app.config['COMPRESSION_MIN_SIZE']
+
+    @app.after_request
+    def compress_response(response):
+        if (response.status_code < 200 or response.status_code in (204, 206)
+                or 'Content-Encoding' in response.headers or 'Accept-Ranges' in response.headers
+                or not is_compressible(response)
+                or 'no-transform' in response.headers.get('Cache-Control', '')):
+            return response
+        # Caches must keep one copy per encoding, whether or not this one is compressed
+        response.vary.add('Accept-Encoding')
+
+        name = request.accept_encodings.best_match(choices)
+        if name is None or name == 'identity':
+            return response
+        if response.status_code == 304:
+            # Nothing is sent, but the validator must be the one of the compressed 200
+            # (the body of the 304 is still held by the response, see conditional.py)
+            if len(response.get_data()) >= min_size:
+                weaken_etag(response)
+            return response
+        if response.is_streamed:
+            response.response = compress_stream(response.response, encoders[name])
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            response.set_data(encoders[name].compress(data))
+
+        response.headers['Content-Encoding'] = name
+        weaken_etag(response)
+        return response
+
+    return encoders
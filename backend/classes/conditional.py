@@ -0,0 +1,52 @@
+'''
+HTTP conditional requests (ETag / If-None-Match) for the GET endpoints.
+
+Every successful GET response gets a strong ETag computed from its body.
+A client sending that ETag back in If-None-Match receives 304 Not Modified
+without a body. Cache-Control is set per blueprint: the lookup tables may be
+reused by clients for a few minutes, everything else has to be revalidated.
+The ETag is computed from the uncompressed body; compressed responses and the
+304 responses of requests that would have been compressed carry it as a weak
+ETag (see compression.py).
+'''
+
+import hashlib
+
+from flask import request
+
+# Cache-Control per blueprint (or endpoint for routes outside a blueprint)
+CACHE_CONTROL = {
+    'terminart': 'private, max-age=300',
+    'wichtigkeit': 'private, max-age=300',
+    'products': 'private, max-age=300',
+    'medium': 'private, max-age=300',
+    'health': 'no-store',
+    'stats': 'no-store',
+    'prometheus_metrics': 'no-store',
+}
+DEFAULT_CACHE_CONTROL = 'private, no-cache'
+
+
+def compute_etag(data: bytes) -> str:
+    """Compute the ETag value of a response body."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def init_conditional_requests(app, cache_control: dict = None):
+    """Register the ETag / Cache-Control handling on the app."""
+    cache_control = {**CACHE_CONTROL, **(cache_control or {})}
+
+    @app.after_request
+    def make_conditional(response):
+        if request.method not in ('GET', 'HEAD'):
+            return response
+
+        directives = cache_control.get(request.blueprint or request.endpoint, DEFAULT_CACHE_CONTROL)
+        response.headers['Cache-Control'] = directives
+
+        # Streamed responses are never held in memory, so they cannot be hashed
+        if response.status_code != 200 or response.is_streamed or directives == 'no-store':
+            return response
+
+        response.set_etag(compute_etag(response.get_data()))
+        return response.make_conditional(request)
@@ -0,0 +1,23 @@
+'''
+Error responses shared by the endpoints.
+
+Unexpected exceptions are answered with a generic 500 response; the
+exception (driver errors include the SQL statement and its parameters) is
+written to the application log instead of the response body. Writes the
+database rejects for a constraint (e.g. a foreign key to a missing row) are
+answered with 400.
+'''
+
+from flask import current_app, jsonify
+
+
+def internal_error(e: Exception):
+    """500 response for an unexpected exception, logged with its traceback."""
+    current_app.logger.error("Unhandled exception", exc_info=e)
+    return jsonify({"error": "Internal server error"}), 500
+
+
+def constraint_error(e: Exception):
+    """400 response for a write rejected by a constraint of the database."""
+    current_app.logger.info("Constraint violated: %s", getattr(e, 'orig', e))
+    return jsonify({"error": "Invalid values: a referenced item does not exist"}), 400
@@ -0,0 +1,57 @@
+'''
+Query parameter filters for the collection endpoints.
+
+    GET /api/termine?from=2025-03-01T00:00:00&to=2025-04-01T00:00:00&art_id=2
+
+Every filter maps one query parameter to a WHERE condition on a column.
+Filters on indexed columns let the database read only the matching rows
+instead of the whole table.
+
+Usage:
+    FILTERS = {'ort': Filter(tables.Termine.Ort)}
+    stmt = apply_filters(select(tables.Termine), request.args, FILTERS)
+'''
+
+import operator
+
+
+class FilterError(ValueError):
+    """Raised for invalid filter values."""
+
+
+class Filter:
+    """Condition on a column, built from a query parameter."""
+
+    def __init__(self, column, compare=operator.eq, parse=str):
+        """
+        Args:
+            column: column attribute the filter applies to
+            compare: operator building the condition from the column and the value
+            parse: callable converting the query parameter into the value
+        """
+        self.column = column
+        self.compare = compare
+        self.parse = parse
+
+    def condition(self, name: str, value: str):
+        try:
+            value = self.parse(value)
+        except (TypeError, ValueError):
+            raise FilterError(f"Invalid value for {name}: {value}")
+        return self.compare(self.column, value)
+
+
+def apply_filters(stmt, args, filters: dict):
+    """
+    Add the conditions of the filters present in the request arguments to a statement.
+
+    Args:
+        stmt: select statement
+        args: request query parameters
+        filters: query parameter -> Filter
+
+    Raises:
+        FilterError: if a value cannot be parsed
+    """
+    conditions = [f.condition(name, args[name]) for name, f in filters.items() if name in args]
+    return stmt.where(*conditions) if conditions else stmt
@@ -0,0 +1,101 @@
+'''
+JSON encoding of the responses.
+
+Serializers hand dates, datetimes and decimals to the provider as they are
+read from the database; the provider writes them in one place:
+
+    date / datetime     ISO 8601 string, e.g. "2025-03-01T10:00:00"
+    Decimal             number (JSON_DECIMAL = 'float', default) or exact
+                        string (JSON_DECIMAL = 'string')
+
+With the optional orjson package (extra "fast") the responses are encoded by
+orjson, otherwise by the json module of the standard library. Both write the
+keys sorted and the same values; orjson writes non-ASCII characters as UTF-8
+instead of \\u escapes.
+
+Config:
+    JSON_PROVIDER: 'auto' (orjson if installed, default), 'orjson' or 'json'
+    JSON_DECIMAL: 'float' or 'string'
+'''
+
+import importlib.util
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+DECIMAL_ENCODERS = {
+    'float': float,
+    'string': str,
+}
+
+
+def _decimal_encoder(app):
+    try:
+        return DECIMAL_ENCODERS[app.config['JSON_DECIMAL']]
+    except KeyError:
+        raise ValueError(f"JSON_DECIMAL must be one of {', '.join(DECIMAL_ENCODERS)}")
+
+
+class StandardJSONProvider(DefaultJSONProvider):
+    """json module of the standard library, with ISO 8601 dates and configurable decimals."""
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.encode_decimal = _decimal_encoder(app)
+
+    def default(self, o):
+        # Flask writes datetimes as HTTP dates and decimals as strings by default
+        if isinstance(o, (date, datetime)):
+            return o.isoformat()
+        if isinstance(o, Decimal):
+            return self.encode_decimal(o)
+        return super().default(o)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """orjson encoder; dates and datetimes are encoded natively, decimals as configured."""
+
+    def __init__(self, app):
+        import orjson
+        super().__init__(app)
+        self.orjson = orjson
+        self.encode_decimal = _decimal_encoder(app)
+        self.options = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if self.sort_keys else 0)
+
+    def default(self, o):
+        if isinstance(o, Decimal):
+            return self.encode_decimal(o)
+        return super().default(o)
+
+    def _encode(self, obj, indent: bool = False) -> bytes:
+        return self.orjson.dumps(obj, default=self.default,
+                                 option=self.options | (self.orjson.OPT_INDENT_2 if indent else 0))
+
+    def dumps(self, obj, **kwargs) -> str:
+        return self._encode(obj, indent=bool(kwargs.get('indent'))).decode()
+
+    def loads(self, s, **kwargs):
+        return self.orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._encode(obj, indent) + b"\n", mimetype=self.mimetype)
+
+
+PROVIDERS = {
+    'orjson': OrjsonProvider,
+    'json': StandardJSONProvider,
+}
+
+
+def init_json_provider(app):
+    """Set the JSON provider of the app according to JSON_PROVIDER."""
+    name = app.config['JSON_PROVIDER']
+    if name == 'auto':
+        name = 'orjson' if importlib.util.find_spec('orjson') is not None else 'json'
+    if name not in PROVIDERS:
+        raise ValueError(f"JSON_PROVIDER must be one of auto, {', '.join(PROVIDERS)}")
+    app.json = PROVIDERS[name](app)
+    return app.json
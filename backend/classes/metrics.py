@@ -0,0 +1,175 @@
+'''
+Prometheus metrics of the API, served as text by GET /metrics.
+
+    http_requests_total{endpoint, method, status}        counter
+    http_request_errors_total{endpoint, method}          counter (status >= 500)
+    http_request_duration_seconds{endpoint, method}      histogram
+    http_requests_in_flight                              gauge
+    db_pool_size / _checked_out / _checked_in / _overflow gauges (QueuePool only)
+    reference_cache_hits_total / _misses_total{table}    counters
+    reference_cache_hit_ratio{table}                     gauge
+
+The endpoint label is the Flask endpoint (e.g. "kontakt.list"), not
+the path, so ids in URLs do not create new series. Everything is kept in the
+process: with several workers every worker reports its own numbers.
+'''
+
+import bisect
+import threading
+import time
+
+from flask import g, request
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+
+    def __init__(self, db=None, cache=None, buckets=DURATION_BUCKETS):
+        self.db = db
+        self.cache = cache
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        # (endpoint, method, status) -> count
+        self._requests = {}
+        # (endpoint, method) -> count
+        self._errors = {}
+        # (endpoint, method) -> [count per bucket (last one is +Inf), sum, count]
+        self._durations = {}
+
+    def request_started(self):
+        with self._lock:
+            self._in_flight += 1
+
+    def request_finished(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def observe(self, endpoint: str, method: str, status: int, duration: float):
+        """Record one finished request."""
+        index = bisect.bisect_left(self.buckets, duration)
+        with self._lock:
+            key = (endpoint, method, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            if status >= 500:
+                self._errors[(endpoint, method)] = self._errors.get((endpoint, method), 0) + 1
+            histogram = self._durations.get((endpoint, method))
+            if histogram is None:
+                histogram = self._durations[(endpoint, method)] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            histogram[0][index] += 1
+            histogram[1] += duration
+            histogram[2] += 1
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        with self._lock:
+            requests = sorted(self._requests.items())
+            errors = sorted(self._errors.items())
+            durations = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._durations.items())
+            in_flight = self._in_flight
+
+        family('http_requests_total', 'counter', 'Finished requests per endpoint, method and status.')
+        for (endpoint, method, status), count in requests:
+            lines.append(f'http_requests_total{_labels(endpoint=endpoint, method=method, status=status)} {count}')
+
+        family('http_request_errors_total', 'counter', 'Requests answered with a 5xx status.')
+        for (endpoint, method), count in errors:
+            lines.append(f'http_request_errors_total{_labels(endpoint=endpoint, method=method)} {count}')
+
+        family('http_request_duration_seconds', 'histogram', 'Request latency per endpoint and method.')
+        for (endpoint, method), (counts, total, count) in durations:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += bucket_count
+                le = bound if bound == '+Inf' else _number(float(bound))
+                lines.append(f'http_request_duration_seconds_bucket{_labels(endpoint=endpoint, method=method, le=le)} {cumulative}')
+            lines.append(f'http_request_duration_seconds_sum{_labels(endpoint=endpoint, method=method)} {_number(total)}')
+            lines.append(f'http_request_duration_seconds_count{_labels(endpoint=endpoint, method=method)} {count}')
+
+        family('http_requests_in_flight', 'gauge', 'Requests currently being handled.')
+        lines.append(f'http_requests_in_flight {in_flight}')
+
+        self._render_pool(lines, family)
+        self._render_cache(lines, family)
+        return '\n'.join(lines) + '\n'
+
+    def _render_pool(self, lines, family):
+        engine = self.db.engine if self.db is not None else None
+        pool = engine.pool if engine is not None else None
+        # Only QueuePool keeps these counters (not the pools used for SQLite)
+        if pool is None or not hasattr(pool, 'checkedout'):
+            return
+        for name, value, help_text in (
+            ('db_pool_size', pool.size(), 'Connections the pool keeps open.'),
+            ('db_pool_checked_out', pool.checkedout(), 'Connections currently in use.'),
+            ('db_pool_checked_in', pool.checkedin(), 'Idle connections in the pool.'),
+            ('db_pool_overflow', pool.overflow(), 'Connections opened beyond the pool size (negative while the pool is not full).'),
+        ):
+            family(name, 'gauge', help_text)
+            lines.append(f'{name} {value}')
+
+    def _render_cache(self, lines, family):
+        if self.cache is None:
+            return
+        stats = self.cache.stats()
+        family('reference_cache_hits_total', 'counter', 'Lookup table reads answered from the cache.')
+        for table, entry in stats.items():
+            lines.append(f'reference_cache_hits_total{_labels(table=table)} {entry["hits"]}')
+        family('reference_cache_misses_total', 'counter', 'Lookup table reads that loaded the table.')
+        for table, entry in stats.items():
+            lines.append(f'reference_cache_misses_total{_labels(table=table)} {entry["misses"]}')
+        family('reference_cache_hit_ratio', 'gauge', 'Share of lookup table reads answered from the cache.')
+        for table, entry in stats.items():
+            reads = entry["hits"] + entry["misses"]
+            lines.append(f'reference_cache_hit_ratio{_labels(table=table)} {_number(entry["hits"] / reads if reads else 0.0)}')
+
+
+def init_metrics(app, db, cache=None) -> Metrics:
+    """
+    Register the request hooks collecting the metrics on the app.
+
+    Call it before the hooks that change the response (conditional requests,
+    compression): after_request hooks run in reverse order, so the metrics
+    then record the final status (304) and include the time of those hooks.
+    """
+    metrics = Metrics(db, cache)
+    app.extensions['metrics'] = metrics
+
+    @app.before_request
+    def start_request():
+        g.metrics_start = time.perf_counter()
+        metrics.request_started()
+
+    @app.after_request
+    def record_request(response):
+        if 'metrics_start' in g:
+            metrics.observe(request.endpoint or 'not_found', request.method, response.status_code,
+                            time.perf_counter() - g.metrics_start)
+        return response
+
+    @app.teardown_request
+    def finish_request(exception=None):
+        if g.pop('metrics_start', None) is not None:
+            metrics.request_finished()
+
+    return metrics
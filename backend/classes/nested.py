@@ -0,0 +1,43 @@
+'''
+Sub-resource routes listing the children of a row.
+
+    GET /api/termine/<id>/teilnehmer     participants of an appointment
+    GET /api/auftrag/<id>/positionen     items of an order
+
+The children are read with a condition on their (indexed) foreign key
+column and returned like the collection endpoint of the child resource,
+including pagination and field selection. Unknown parents are answered
+with 404.
+'''
+
+from flask import jsonify
+from sqlalchemy import select
+
+from backend.classes.errors import internal_error
+
+
+def init_nested_route(blueprint, db, name: str, parent, column, list_children, not_found: str):
+    """
+    Add GET /<parent id>/<name> to the blueprint of the parent resource.
+
+    Args:
+        blueprint: blueprint of the parent resource
+        db: database instance
+        name: path segment and endpoint suffix, e.g. "teilnehmer"
+        parent: mapped table class of the parent
+        column: foreign key column of the child table referencing the parent
+        list_children: list function of the child resource, list_children(db, *conditions)
+        not_found: error message for unknown parents
+    """
+    def get_children(parent_id):
+        try:
+            with db.session as session:
+                found = session.execute(select(parent.id).where(parent.id == parent_id)).first()
+        except Exception as e:
+            return internal_error(e)
+        if found is None:
+            return jsonify({"error": not_found}), 404
+        return list_children(db, column == parent_id)
+
+    get_children.__doc__ = f"Get the {name} of a {parent.__tablename__} row"
+    blueprint.add_url_rule(f'/<int:parent_id>/{name}', f'get_{name}', get_children, methods=['GET'])
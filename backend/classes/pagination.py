@@ -0,0 +1,185 @@
+'''
+Keyset (cursor) pagination for the collection endpoints.
+
+Query parameters:
+    limit   number of items per page (default 100, at most 1000)
+    after   cursor returned as "next_cursor" by the previous page
+    all     "true" returns the complete table like before pagination existed
+
+Usage:
+    page = Page.from_args(request.args)
+    stmt = page.apply(select(tables.Adresse.id, tables.Adresse.ortsname), tables.Adresse.id)
+    rows, next_cursor = page.split(session.execute(stmt).all())
+'''
+
+import base64
+import binascii
+import json
+import math
+from datetime import date, datetime
+
+import sqlalchemy
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+# Integer cursor values outside BIGINT are rejected before they reach the driver
+MIN_INT = -2 ** 63
+MAX_INT = 2 ** 63 - 1
+
+
+class PaginationError(ValueError):
+    """Raised for invalid pagination query parameters."""
+
+
+def encode_cursor(values: list) -> str:
+    """Encode the sort key values of the last item of a page into an opaque cursor."""
+    values = [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values]
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> list:
+    """Decode a cursor created by encode_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise PaginationError("Invalid cursor")
+    if not isinstance(values, list):
+        raise PaginationError("Invalid cursor")
+    return values
+
+
+def sort_key(key):
+    """Split an ORDER BY expression into the expression and its direction."""
+    if isinstance(key, UnaryExpression) and key.modifier is operators.desc_op:
+        return key.element, True
+    if isinstance(key, UnaryExpression) and key.modifier is operators.asc_op:
+        return key.element, False
+    return key, False
+
+
+def _coerce(expression, value):
+    """
+    Convert a cursor value back to the python type of its sort key.
+
+    Raises:
+        PaginationError: if the value is not a scalar of the type of the sort key, an
+            integer outside BIGINT, a non-finite number or a datetime whose timezone
+            does not match the column
+    """
+    sql_type = expression.type
+    # bool is an int, but only Boolean keys take it
+    if isinstance(value, bool) != isinstance(sql_type, sqlalchemy.Boolean):
+        raise PaginationError("Invalid cursor")
+    try:
+        if isinstance(sql_type, (sqlalchemy.DateTime, sqlalchemy.Date)):
+            if not isinstance(value, str):
+                raise ValueError
+            if isinstance(sql_type, sqlalchemy.DateTime):
+                value = datetime.fromisoformat(value)
+                # Naive columns only take naive values, like the ones encode_cursor writes
+                if (value.tzinfo is not None) != bool(sql_type.timezone):
+                    raise ValueError
+                return value
+            return date.fromisoformat(value)
+        if isinstance(sql_type, sqlalchemy.Integer):
+            if not isinstance(value, int):
+                raise ValueError
+        elif isinstance(sql_type, sqlalchemy.Numeric):
+            if not isinstance(value, (int, float)):
+                raise ValueError
+        elif isinstance(sql_type, sqlalchemy.String):
+            if not isinstance(value, str):
+                raise ValueError
+        elif not isinstance(value, (str, int, float)):
+            raise ValueError
+        if isinstance(value, int) and not isinstance(value, bool) and not MIN_INT <= value <= MAX_INT:
+            raise ValueError
+        if isinstance(value, float) and not math.isfinite(value):
+            raise ValueError
+    except (TypeError, ValueError):
+        raise PaginationError("Invalid cursor")
+    return value
+
+
+class Page:
+
+    def __init__(self, limit: int = DEFAULT_LIMIT, after: list = None, full: bool = False):
+        self.limit = limit
+        self.after = after
+        self.full = full
+        self.keys = []
+
+    @classmethod
+    def from_args(cls, args) -> 'Page':
+        """
+        Create a page from the request query parameters.
+
+        Raises:
+            PaginationError: if limit or after are invalid
+        """
+        if args.get('all', '').lower() in ('1', 'true', 'yes'):
+            return cls(full=True)
+
+        limit = args.get('limit', DEFAULT_LIMIT)
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise PaginationError("limit must be an integer")
+        if not 1 <= limit <= MAX_LIMIT:
+            raise PaginationError(f"limit must be between 1 and {MAX_LIMIT}")
+
+        after = args.get('after')
+        return cls(limit=limit, after=decode_cursor(after) if after else None)
+
+    def apply(self, stmt, *keys):
+        """
+        Order the statement by the given keys and restrict it to the current page.
+
+        The keys must identify an item uniquely, so the last one is usually the
+        primary key. Descending keys are passed as sqlalchemy.desc(column).
+        """
+        self.keys = [sort_key(key) for key in keys]
+        stmt = stmt.order_by(*keys)
+        if self.full:
+            return stmt
+
+        if self.after is not None:
+            if len(self.after) != len(self.keys):
+                raise PaginationError("Invalid cursor")
+            values = [_coerce(expression, value) for (expression, _), value in zip(self.keys, self.after)]
+            # (k1, k2, ...) > (v1, v2, ...) written out so every key can have its own direction
+            conditions = []
+            for i, ((expression, descending), value) in enumerate(zip(self.keys, values)):
+                equal = [previous == values[j] for j, (previous, _) in enumerate(self.keys[:i])]
+                beyond = expression < value if descending else expression > value
+                conditions.append(sqlalchemy.and_(*equal, beyond))
+            stmt = stmt.where(sqlalchemy.or_(*conditions))
+
+        # One extra row tells whether there is a next page
+        return stmt.limit(self.limit + 1)
+
+    def split(self, rows, cursor_values=None):
+        """
+        Cut the extra row fetched by apply() and build the cursor of the next page.
+
+        Args:
+            rows: result rows of the statement returned by apply()
+            cursor_values: callable returning the sort key values of a row,
+                defaults to reading the key columns as attributes of the row (column rows or ORM entities)
+
+        Returns:
+            tuple: (rows of this page, next cursor or None)
+        """
+        rows = list(rows)
+        if self.full or len(rows) <= self.limit:
+            return rows, None
+
+        rows = rows[:self.limit]
+        if cursor_values is None:
+            def cursor_values(row):
+                return [getattr(row, expression.key) for expression, _ in self.keys]
+        return rows, encode_cursor(list(cursor_values(rows[-1])))
@@ -0,0 +1,421 @@
+'''
+Declarative resources: one declaration per table generates its blueprint.
+
+    GET    /api/<name>          list (pagination, ?fields= / ?expand=, filters, ?stream=ndjson)
+    GET    /api/<name>/<id>     single item with all nested objects
+    POST   /api/<name>          create, returns the stored fields
+    PUT    /api/<name>/<id>     update the given fields, returns the stored fields
+    DELETE /api/<name>/<id>     delete
+           /api/<name>/bulk     bulk writes (see bulk.py)
+
+Usage:
+    FIELDS = {'name': Field('Name'), 'adresse_id': Field('Adresse')}
+    RELATIONS = {'adresse': embed(tables.Person.adresse)}
+    persons = Resource('person', tables.Person, 'persons', "Person", FIELDS, ['name'], RELATIONS)
+    app.register_blueprint(persons.blueprint(db))
+
+Every resource is registered by its table. Nested objects are serialized by
+the resource of their table, either read through a relationship (embed) or
+from the reference cache (lookup).
+
+The list endpoints are read-only and select column rows instead of ORM
+objects, so nothing is added to the identity map of the session. The nested
+objects of a page are read with one IN query per relation (Resource.fetch).
+Single items, creates and updates work with ORM objects.
+
+Serializers are compiled per combination of selected fields and expanded
+relations: they read exactly the selected attributes instead of building
+every field and filtering afterwards. Dates and decimals are left to the
+JSON provider (see json_provider.py).
+'''
+
+from operator import attrgetter
+
+from flask import Blueprint, jsonify, request
+from sqlalchemy import delete, inspect, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import undefer
+
+from backend.classes.bulk import init_bulk_routes, load_values
+from backend.classes.cache import current_reference_cache
+from backend.classes.errors import constraint_error, internal_error
+from backend.classes.filtering import FilterError, apply_filters
+from backend.classes.pagination import Page, PaginationError
+from backend.classes.selection import FieldSelectionError, Relation, Selection
+from backend.classes.streaming import ndjson_response, wants_stream
+
+# Mapped table class -> Resource
+RESOURCES = {}
+
+# Values per IN list when nested rows are read (see Resource.fetch)
+FETCH_BATCH_SIZE = 500
+
+
+class ValidationError(ValueError):
+    """Raised for invalid request bodies of the single item endpoints."""
+
+
+def resource_of(table) -> 'Resource':
+    """Get the resource registered for a table."""
+    try:
+        return RESOURCES[table]
+    except KeyError:
+        raise LookupError(f"No resource registered for table {table.__tablename__}")
+
+
+def _serializer_of(table, expand=(), exclude=()):
+    """
+    Serializer of the resource of a table, compiled on first use.
+
+    Resources refer to each other, so the resource of the table may be
+    declared after the relation that needs it.
+    """
+    compiled = []
+
+    def serialize(obj):
+        if not compiled:
+            compiled.append(resource_of(table).serializer(expanded=set(expand), excluded=exclude))
+        return compiled[0](obj)
+    return serialize
+
+
+def embed(relationship, expand=(), exclude=()) -> Relation:
+    """
+    Nested object read through a many-to-one relationship.
+
+    Args:
+        relationship: relationship attribute, e.g. tables.Protokoll.termin
+        expand: relations of the related resource to nest as well
+        exclude: fields of the related resource to leave out
+    """
+    prop = relationship.property
+    (local, remote), = prop.local_remote_pairs
+    column = prop.parent.get_property_by_column(local).key
+    remote_column = prop.mapper.get_property_by_column(remote).key
+    target = prop.mapper.class_
+    get_key = attrgetter(column)
+    get_related = attrgetter(relationship.key)
+    serialize_related = _serializer_of(target, expand, exclude)
+
+    def serialize(obj):
+        related = get_related(obj)
+        return None if related is None else serialize_related(related)
+
+    def load(session, rows):
+        # The related rows of all rows with one IN query, like selectinload
+        related = resource_of(target).fetch(session, {get_key(row) for row in rows}, remote_column,
+                                            expanded=set(expand), excluded=exclude)
+
+        def nested(row):
+            return related.get(get_key(row))
+        return nested
+    return Relation([column], serialize, load)
+
+
+def lookup(column: str, table) -> Relation:
+    """
+    Nested row of a small lookup table, read from the reference cache.
+
+    Args:
+        column: foreign key column attribute, e.g. 'Art'
+        table: mapped table class the column refers to
+    """
+    get_key = attrgetter(column)
+    serialize_row = _serializer_of(table)
+
+    def serialize(obj):
+        row = current_reference_cache().get(table, get_key(obj))
+        return None if row is None else serialize_row(row)
+
+    def load(session, rows):
+        # The cache of the current app, looked up once per page
+        cache = current_reference_cache()
+
+        def nested(row):
+            related = cache.get(table, get_key(row))
+            return None if related is None else serialize_row(related)
+        return nested
+    return Relation([column], serialize, load)
+
+
+class Resource:
+
+    def __init__(self, name: str, table, collection: str, label: str, fields: dict, required=(),
+                 relations: dict = None, filters: dict = None, deferred=(), computed=(), order_by=None):
+        """
+        Args:
+            name: blueprint name and path segment (/api/<name>)
+            table: mapped table class
+            collection: JSON key of the items in list responses
+            label: name used in messages, e.g. "Product" for "Product not found"
+            fields: JSON key -> Field of the column fields
+            required: JSON keys required to create an item
+            relations: nested object key -> Relation (see embed and lookup)
+            filters: query parameter -> Filter of the list endpoint
+            deferred: field keys only listed when named in ?fields=
+            computed: labelled SQL expressions added to the items of the list endpoint
+            order_by: sort keys of the list endpoint, identifying an item uniquely (default: id)
+        """
+        self.name = name
+        self.table = table
+        self.collection = collection
+        self.label = label
+        self.fields = fields
+        self.required = list(required)
+        self.relations = relations or {}
+        self.filters = filters or {}
+        self.deferred = list(deferred)
+        self.computed = list(computed)
+        self.order_by = tuple(order_by or (table.id,))
+
+        columns = inspect(table).columns
+        # null is rejected for these instead of failing on the NOT NULL constraint
+        self.not_null = {key for key, field in fields.items() if not columns[field.attribute].nullable}
+        self.dumps = {key: field.dump for key, field in fields.items()}
+        # Column rows of the fields serialize like the ORM objects
+        self.columns = [table.id, *(getattr(table, field.attribute) for field in fields.values())]
+        # Single items come with their deferred fields, their nested objects are loaded lazily
+        self.item_options = [undefer(getattr(table, fields[key].attribute)) for key in self.deferred]
+        self.serialize_item = self.serializer()
+        self.serialize_fields = self.serializer(expanded=())
+        RESOURCES[table] = self
+
+    def serializer(self, selected=None, expanded=None, excluded=(), nested=None):
+        """
+        Compile a serializer of single items (ORM objects or rows with the same attributes).
+
+        Args:
+            selected: field keys to include ("id" is always included), None for all
+            expanded: relation keys to include, None for all
+            excluded: field keys to leave out
+            nested: (key, callable) pairs of the nested objects, instead of the
+                serialize callables of the expanded relations (see _rows_serializer)
+        """
+        keys = [key for key in self.fields
+                if (selected is None or key in selected) and key not in excluded]
+        names = ('id', *keys)
+        get_values = attrgetter(*('id', *(self.fields[key].attribute for key in keys)))
+        if not keys:
+            get_id = get_values
+
+            def get_values(obj):
+                return (get_id(obj),)
+        dumps = [(key, self.dumps[key]) for key in keys if self.dumps[key] is not None]
+        if nested is None:
+            nested = [(key, relation.serialize) for key, relation in self.relations.items()
+                      if expanded is None or key in expanded]
+
+        def serialize(obj):
+            data = dict(zip(names, get_values(obj)))
+            for key, dump in dumps:
+                if data[key] is not None:
+                    data[key] = dump(data[key])
+            for key, serialize_nested in nested:
+                value = serialize_nested(obj)
+                if value is not None:
+                    data[key] = value
+            return data
+        return serialize
+
+    def _rows_serializer(self, session, rows, selected=None, expanded=None, excluded=()):
+        """Serializer of column rows, with the nested objects of all rows loaded at once."""
+        nested = [(key, relation.load(session, rows)) for key, relation in self.relations.items()
+                  if expanded is None or key in expanded]
+        return self.serializer(selected, excluded=excluded, nested=nested)
+
+    def _list_serializer(self, session, rows, selection):
+        """Serializer of the rows of the list endpoint, including the computed values."""
+        serialize = self._rows_serializer(session, rows, selection.selected, selection.expanded)
+        computed = [(expression.key, attrgetter(expression.key)) for expression in self.computed
+                    if selection.selected is None or expression.key in selection.selected]
+        if not computed:
+            return serialize
+
+        def serialize_row(row):
+            data = serialize(row)
+            for key, get_value in computed:
+                value = get_value(row)
+                if value is not None:
+                    data[key] = value
+            return data
+        return serialize_row
+
+    def fetch(self, session, values, column: str = 'id', expanded=None, excluded=()) -> dict:
+        """
+        Read and serialize the rows whose column has one of the given values.
+
+        Args:
+            values: column values, None is ignored
+            column: attribute name of the column, e.g. 'id'
+            expanded: relation keys to include, None for all
+            excluded: field keys to leave out
+
+        Returns:
+            dict: column value -> serialized row
+        """
+        values = sorted(value for value in values if value is not None)
+        selected = {key for key in self.fields if key not in excluded} if excluded else None
+        key = getattr(self.table, column)
+        columns = Selection(self.table, self.fields, self.relations, selected, expanded).columns(key)
+        rows = []
+        for start in range(0, len(values), FETCH_BATCH_SIZE):
+            rows.extend(session.execute(
+                select(*columns).where(key.in_(values[start:start + FETCH_BATCH_SIZE]))
+            ).all())
+        serialize = self._rows_serializer(session, rows, selected, expanded, excluded)
+        get_key = attrgetter(column)
+        return {get_key(row): serialize(row) for row in rows}
+
+    def _load(self, data, required=()) -> dict:
+        """
+        Convert the body of a single item request into column values.
+
+        Raises:
+            ValidationError: if the body is not an object, misses required fields or has invalid values
+                (including null for a non-nullable column)
+        """
+        if not isinstance(data, dict):
+            raise ValidationError("Expected a JSON object")
+        if any(key not in data for key in required):
+            # The bulk endpoints name the missing fields per item
+            if len(required) == 1:
+                raise ValidationError(f"Missing required field: {required[0]}")
+            raise ValidationError("Missing required fields")
+        try:
+            return load_values(data, self.fields, not_null=self.not_null)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+    def _select_item(self, session, item_id):
+        return session.execute(
+            select(self.table).options(*self.item_options).where(self.table.id == item_id)
+        ).scalar_one_or_none()
+
+    def list_items(self, db, *conditions):
+        """One page of the items matching the conditions (query parameters as for GET /api/<name>)"""
+        try:
+            selection = Selection.from_args(request.args, self.table, self.fields, self.relations,
+                                            extra=[expression.key for expression in self.computed],
+                                            deferred=self.deferred)
+            # Column rows instead of ORM objects: nothing is tracked by the session
+            query = select(*selection.columns(*self.order_by), *self.computed).where(*conditions)
+            query = apply_filters(query, request.args, self.filters)
+
+            def serialize_rows(session, rows):
+                serialize = self._list_serializer(session, rows, selection)
+                return [serialize(row) for row in rows]
+
+            if wants_stream(request.args):
+                # Exports are read in primary key order: every batch is a range of the
+                # primary key, while other sort keys would sort the table again per batch
+                return ndjson_response(db, query, (self.table.id,), serialize_rows)
+
+            page = Page.from_args(request.args)
+            with db.session as session:
+                rows, next_cursor = page.split(session.execute(page.apply(query, *self.order_by)).all())
+                items = serialize_rows(session, rows)
+            return jsonify({self.collection: items, "count": len(items), "next_cursor": next_cursor}), 200
+        except (PaginationError, FieldSelectionError, FilterError) as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception as e:
+            return internal_error(e)
+
+    def get_item(self, db, item_id):
+        """A single item with all nested objects"""
+        try:
+            with db.session as session:
+                item = self._select_item(session, item_id)
+                if item is None:
+                    return jsonify({"error": f"{self.label} not found"}), 404
+                return jsonify(self.serialize_item(item)), 200
+        except Exception as e:
+            return internal_error(e)
+
+    def create_item(self, db):
+        """Create an item from the JSON body"""
+        try:
+            values = self._load(request.get_json(silent=True), self.required)
+            with db.session as session:
+                item = self.table(**values)
+                session.add(item)
+                session.flush()
+                item_id = item.id
+                session.commit()
+                current_reference_cache().invalidate(self.table)
+                # Read back what the database stored (types, defaults)
+                return jsonify(self.serialize_fields(self._select_item(session, item_id))), 201
+        except ValidationError as e:
+            return jsonify({"error": str(e)}), 400
+        except IntegrityError as e:
+            return constraint_error(e)
+        except Exception as e:
+            return internal_error(e)
+
+    def update_item(self, db, item_id):
+        """Update the fields given in the JSON body"""
+        try:
+            values = self._load(request.get_json(silent=True))
+            with db.session as session:
+                if values:
+                    result = session.execute(
+                        update(self.table).where(self.table.id == item_id).values(
+                            {getattr(self.table, attribute): value for attribute, value in values.items()}
+                        )
+                    )
+                    if result.rowcount == 0:
+                        session.rollback()
+                        return jsonify({"error": f"{self.label} not found"}), 404
+                    session.commit()
+                    current_reference_cache().invalidate(self.table)
+                item = self._select_item(session, item_id)
+                if item is None:
+                    return jsonify({"error": f"{self.label} not found"}), 404
+                return jsonify(self.serialize_fields(item)), 200
+        except ValidationError as e:
+            return jsonify({"error": str(e)}), 400
+        except IntegrityError as e:
+            return constraint_error(e)
+        except Exception as e:
+            return internal_error(e)
+
+    def delete_item(self, db, item_id):
+        """Delete an item"""
+        try:
+            with db.session as session:
+                result = session.execute(delete(self.table).where(self.table.id == item_id))
+                if result.rowcount == 0:
+                    session.rollback()
+                    return jsonify({"error": f"{self.label} not found"}), 404
+                session.commit()
+            current_reference_cache().invalidate(self.table)
+            return jsonify({"message": f"{self.label} deleted successfully"}), 200
+        except Exception as e:
+            return internal_error(e)
+
+    def blueprint(self, db) -> Blueprint:
+        """Create the blueprint with the list, single item and bulk endpoints."""
+        bp = Blueprint(self.name, __name__, url_prefix=f'/api/{self.name}')
+
+        def list_view():
+            return self.list_items(db)
+
+        def get_view(item_id):
+            return self.get_item(db, item_id)
+
+        def create_view():
+            return self.create_item(db)
+
+        def update_view(item_id):
+            return self.update_item(db, item_id)
+
+        def delete_view(item_id):
+            return self.delete_item(db, item_id)
+
+        bp.add_url_rule('', 'list', list_view, methods=['GET'])
+        bp.add_url_rule('', 'create', create_view, methods=['POST'])
+        bp.add_url_rule('/<int:item_id>', 'get', get_view, methods=['GET'])
+        bp.add_url_rule('/<int:item_id>', 'update', update_view, methods=['PUT'])
+        bp.add_url_rule('/<int:item_id>', 'delete', delete_view, methods=['DELETE'])
+        init_bulk_routes(bp, db, self.table, self.fields, self.required, self.not_null,
+                         after_commit=lambda: current_reference_cache().invalidate(self.table))
+        return bp
@@ -0,0 +1,113 @@
+'''
+Field selection (sparse fieldsets) for the collection endpoints.
+
+    GET /api/protokoll?fields=id,tldr,datum          only these fields, no nested objects
+    GET /api/protokoll?fields=tldr&expand=termin     tldr plus the nested termin
+    GET /api/teilnehmer?expand=kontakt               all fields, only the nested kontakt
+    GET /api/teilnehmer?expand=                      all fields, no nested objects
+
+Without ?fields= and ?expand= the full objects are returned, except for
+deferred fields (e.g. the text of a protocol) which are only returned when
+named in ?fields=. "id" is always included. Nested objects can also be
+requested by naming them in ?fields=.
+
+Only the selected columns are read (see Selection.columns) and only the
+expanded relations are resolved. The serializer of the selection (see
+resource.Resource.serializer) only reads the selected attributes.
+'''
+
+
+class FieldSelectionError(ValueError):
+    """Raised for unknown names in ?fields= or ?expand=."""
+
+
+class Relation:
+    """Nested object of a resource that is only resolved when expanded."""
+
+    def __init__(self, columns=(), serialize=None, load=None):
+        """
+        Args:
+            columns: column attributes needed to resolve the nested object
+            serialize: callable returning the nested object of an ORM item, or None to leave it out
+            load: callable load(session, rows) resolving the nested objects of a list of
+                column rows at once, returns the callable giving the nested object of a row
+        """
+        self.columns = tuple(columns)
+        self.serialize = serialize
+        self.load = load
+
+
+def _parse_names(value: str) -> list:
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+class Selection:
+
+    def __init__(self, table, fields: dict, relations: dict = None, selected=None, expanded=None):
+        """
+        Args:
+            table: mapped table class of the resource
+            fields: JSON key -> Field of the column fields (see bulk.FIELDS)
+            relations: nested object key -> Relation
+            selected: selected field keys, None for all
+            expanded: expanded relation keys, None for all
+        """
+        self.table = table
+        self.fields = fields
+        self.relations = relations or {}
+        self.selected = selected
+        self.expanded = expanded
+
+    @classmethod
+    def from_args(cls, args, table, fields: dict, relations: dict = None, extra=(), deferred=()) -> 'Selection':
+        """
+        Create the selection from the request arguments.
+
+        Args:
+            extra: output keys that can be selected but are not backed by a column of the table
+            deferred: field keys that are only returned when named in ?fields=
+
+        Raises:
+            FieldSelectionError: for unknown field or relation names
+        """
+        relations = relations or {}
+        selected = expanded = None
+
+        if 'fields' in args:
+            names = _parse_names(args['fields'])
+            unknown = [name for name in names
+                       if name != 'id' and name not in fields and name not in relations and name not in extra]
+            if unknown:
+                raise FieldSelectionError(f"Unknown fields: {', '.join(unknown)}")
+            selected = {name for name in names if name not in relations}
+            expanded = {name for name in names if name in relations}
+        elif deferred:
+            selected = {'id', *fields, *extra} - set(deferred)
+
+        if 'expand' in args:
+            names = _parse_names(args['expand'])
+            unknown = [name for name in names if name not in relations]
+            if unknown:
+                raise FieldSelectionError(f"Unknown relations: {', '.join(unknown)}")
+            expanded = (expanded or set()) | set(names)
+
+        return cls(table, fields, relations, selected, expanded)
+
+    def is_expanded(self, relation: str) -> bool:
+        return self.expanded is None or relation in self.expanded
+
+    def columns(self, *keys) -> list:
+        """
+        Column attributes to read: id, the selected fields and the columns of the expanded relations.
+
+        Args:
+            keys: sort keys of the statement (see Page.apply), always read to build the next cursor
+        """
+        names = ['id']
+        names.extend(field.attribute for key, field in self.fields.items()
+                     if self.selected is None or key in self.selected)
+        for name, relation in self.relations.items():
+            if self.is_expanded(name):
+                names.extend(relation.columns)
+        names.extend(key.key for key in keys if getattr(key, 'class_', None) is self.table)
+        return [getattr(self.table, name) for name in dict.fromkeys(names)]
@@ -0,0 +1,54 @@
+'''
+Streaming of complete tables as newline delimited JSON (NDJSON).
+
+All collection endpoints switch to streaming with ?stream=ndjson.
+The rows are read in keyset batches and every row is written to the response
+as soon as its batch is loaded, so memory use stays flat regardless of the
+size of the table. The keys should be indexed (the collection endpoints stream
+in primary key order): the statement of every batch is ordered by them, so
+keys computed per row would be computed and sorted for the whole table again
+for each batch.
+'''
+
+from flask import Response, current_app, stream_with_context
+
+from backend.classes.pagination import Page, decode_cursor
+
+STREAM_BATCH_SIZE = 500
+
+
+def wants_stream(args) -> bool:
+    """Check whether the request asks for a streamed NDJSON response."""
+    return args.get('stream', '').lower() == 'ndjson'
+
+
+def ndjson_response(db, stmt, keys, serialize_rows, cursor_values=None, batch_size: int = STREAM_BATCH_SIZE) -> Response:
+    """
+    Stream all rows of a statement as NDJSON.
+
+    Args:
+        db: AivenDatabase the rows are read from
+        stmt: column-level select statement
+        keys: indexed sort keys identifying a row uniquely, e.g. the primary key (see Page.apply)
+        serialize_rows: callable serialize_rows(session, rows) turning a batch of rows
+            into JSON serializable dicts (nested objects are loaded per batch)
+        cursor_values: callable returning the key values of a row (see Page.split)
+        batch_size: number of rows loaded per statement
+
+    Returns:
+        Response: streamed application/x-ndjson response
+    """
+    def generate():
+        dumps = current_app.json.dumps
+        with db.session as session:
+            after = None
+            while True:
+                page = Page(limit=batch_size, after=after)
+                rows, next_cursor = page.split(session.execute(page.apply(stmt, *keys)).all(), cursor_values)
+                for data in serialize_rows(session, rows):
+                    yield dumps(data) + "\n"
+                if next_cursor is None:
+                    break
+                after = decode_cursor(next_cursor)
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
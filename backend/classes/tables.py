@@ -1,9 +1,14 @@
 import sqlalchemy
-from sqlalchemy.orm import DeclarativeBase, relationship
+from sqlalchemy.orm import DeclarativeBase, deferred, relationship
 
 class Base(DeclarativeBase):
     pass
 
+# Every foreign key column is indexed (index=True): the API looks rows up by
+# them (e.g. the participants of an appointment) and not every database
+# indexes foreign keys on its own. Index changes need a migration in
+# backend/migrations.py.
+
 class Adresse(Base):
     __tablename__ = 'Adresse'
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True, autoincrement=True)
@@ -15,17 +20,19 @@ class Adresse(Base):
 class Person(Base):
     __tablename__ = 'Person'
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True, autoincrement=True)
-    Adresse = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Adresse.id'), nullable=False)
+    Adresse = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Adresse.id'), nullable=False, index=True)
     Name = sqlalchemy.Column(sqlalchemy.String(255), nullable=False)
     Geburtsdatum = sqlalchemy.Column(sqlalchemy.Date, nullable=False)
     Titel = sqlalchemy.Column(sqlalchemy.String(255), nullable=False)
+    adresse = relationship('Adresse')
 
 class Unternehmen(Base):
     __tablename__ = 'Unternehmen'
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True, autoincrement=True)
     Name = sqlalchemy.Column(sqlalchemy.String(255), nullable=False)
-    Adresse = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Adresse.id'), nullable=False)
+    Adresse = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Adresse.id'), nullable=False, index=True)
     Umsatz = sqlalchemy.Column(sqlalchemy.Integer, nullable=False)
+    adresse = relationship('Adresse')
 
 class Kontakt(Base):
     __tablename__ = 'Kontakt'
@@ -33,9 +40,11 @@ class Kontakt(Base):
     EMail = sqlalchemy.Column('E-Mail', sqlalchemy.String(255), nullable=False)
     Telefonnummer = sqlalchemy.Column(sqlalchemy.String(255), nullable=False)
     Rolle = sqlalchemy.Column(sqlalchemy.String(255), nullable=False)
-    PersonId = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Person.id'), nullable=True)
-    UnternehmenId = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Unternehmen.id'), nullable=True)
+    PersonId = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Person.id'), nullable=True, index=True)
+    UnternehmenId = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Unternehmen.id'), nullable=True, index=True)
     RefTyp = sqlalchemy.Column(sqlalchemy.String(255), nullable=False)
+    person = relationship('Person')
+    unternehmen = relationship('Unternehmen')
 
 class Terminart(Base):
     __tablename__ = 'Terminart'
@@ -44,29 +53,37 @@ class Terminart(Base):
 
 class Termine(Base):
     __tablename__ = 'Termine'
+    # Calendar windows (Start < end AND Ende > start) and the "from" filter
+    __table_args__ = (sqlalchemy.Index('ix_Termine_Start_Ende', 'Start', 'Ende'),)
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True, autoincrement=True)
     Titel = sqlalchemy.Column(sqlalchemy.String(255), nullable=False)
-    Ort = sqlalchemy.Column(sqlalchemy.String(255), nullable=False)
-    Art = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Terminart.id'), nullable=False)
+    # Ort, Ende and Uid are indexed for the filters of GET /api/termine, Start by ix_Termine_Start_Ende
+    Ort = sqlalchemy.Column(sqlalchemy.String(255), nullable=False, index=True)
+    Art = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Terminart.id'), nullable=False, index=True)
     Start = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False)
-    Ende = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False)
-    Uid = sqlalchemy.Column(sqlalchemy.String(255), nullable=False)
+    Ende = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False, index=True)
+    Uid = sqlalchemy.Column(sqlalchemy.String(255), nullable=False, index=True)
+    art = relationship('Terminart')
 
 class Protokoll(Base):
     __tablename__ = 'Protokoll'
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True, autoincrement=True)
     Datum = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False)
-    Text = sqlalchemy.Column(sqlalchemy.Text, nullable=False)
+    # Full transcript, only loaded when accessed (see GET /api/protokoll/<id>/text)
+    Text = deferred(sqlalchemy.Column(sqlalchemy.Text, nullable=False))
     Dauer = sqlalchemy.Column(sqlalchemy.Integer, nullable=False)
     TLDR = sqlalchemy.Column(sqlalchemy.String(255), nullable=False)
-    Termin = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Termine.id'), nullable=False)
+    Termin = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Termine.id'), nullable=False, index=True)
+    termin = relationship('Termine')
 
 class Teilnehmer(Base):
     __tablename__ = 'Teilnehmer'
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True, autoincrement=True)
-    Kontakt = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Kontakt.id'), nullable=False)
-    Termin = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Termine.id'), nullable=False)
+    Kontakt = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Kontakt.id'), nullable=False, index=True)
+    Termin = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Termine.id'), nullable=False, index=True)
     istHaupt = sqlalchemy.Column(sqlalchemy.Boolean, nullable=False)
+    kontakt = relationship('Kontakt')
+    termin = relationship('Termine')
 
 class Medium(Base):
     __tablename__ = 'Medium'
@@ -77,8 +94,10 @@ class Medium(Base):
 class Anhang(Base):
     __tablename__ = 'Anhang'
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True, autoincrement=True)
-    Protokoll = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Protokoll.id'), nullable=False)
-    Medium = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Medium.id'), nullable=False)
+    Protokoll = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Protokoll.id'), nullable=False, index=True)
+    Medium = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Medium.id'), nullable=False, index=True)
+    protokoll = relationship('Protokoll')
+    medium = relationship('Medium')
 
 class Produkt(Base):
     __tablename__ = 'Produkt'
@@ -95,13 +114,18 @@ class Auftrag(Base):
     __tablename__ = 'Auftrag'
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True, autoincrement=True)
     Bezeichnung = sqlalchemy.Column(sqlalchemy.String(255), nullable=False)
-    wichtigkeit = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Wichtigkeit.id'), nullable=True)
-    Kontakt = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Kontakt.id'), nullable=False)
-    terminid = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Termine.id'), nullable=True)
+    wichtigkeit = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Wichtigkeit.id'), nullable=True, index=True)
+    Kontakt = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Kontakt.id'), nullable=False, index=True)
+    terminid = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Termine.id'), nullable=True, index=True)
+    # "wichtigkeit" is already taken by the foreign key column
+    wichtigkeit_ref = relationship('Wichtigkeit')
+    kontakt = relationship('Kontakt')
 
 class Auftragsposition(Base):
     __tablename__ = 'Auftragsposition'
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True, autoincrement=True)
-    Auftrag = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Auftrag.id'), nullable=False)
-    Produkt = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Produkt.id'), nullable=False)
+    Auftrag = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Auftrag.id'), nullable=False, index=True)
+    Produkt = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('Produkt.id'), nullable=False, index=True)
+    auftrag = relationship('Auftrag')
+    produkt = relationship('Produkt')
 
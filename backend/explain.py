@@ -0,0 +1,122 @@
+'''
+EXPLAIN check of the lookups the API performs.
+
+Usage:
+    python main.py explain [--url URL]
+
+Sends the requests of EXPLAIN_REQUESTS to the application (test client, no
+server needed), records the SQL statements they execute and runs EXPLAIN on
+each statement that looks rows up (WHERE or JOIN). Tables read with a full
+scan by such a statement are reported and the exit code is 1.
+
+Plain listings (GET /api/<resource>) read the whole table by design and are
+not part of the check. The result depends on the database: MySQL may scan
+very small tables even if an index exists, so run it against realistic data.
+'''
+
+import argparse
+import re
+import sys
+
+import sqlalchemy
+
+# GET requests whose statements must use indexes
+EXPLAIN_REQUESTS = [
+    '/api/products/1',
+    '/api/adresse/1',
+    '/api/person/1',
+    '/api/unternehmen/1',
+    '/api/kontakt/1',
+    '/api/terminart/1',
+    '/api/termine/1',
+    '/api/protokoll/1',
+    '/api/protokoll/1/text',
+    '/api/teilnehmer/1',
+    '/api/medium/1',
+    '/api/anhang/1',
+    '/api/wichtigkeit/1',
+    '/api/auftrag/1',
+    '/api/auftragsposition/1',
+    '/api/termine?from=2025-01-01T00:00:00&to=2025-02-01T00:00:00',
+    '/api/termine?art_id=1',
+    '/api/termine?ort=Berlin',
+    '/api/termine?uid=1',
+    '/api/termine/window?start=2025-01-01T00:00:00&end=2025-02-01T00:00:00',
+    '/api/termine/1/teilnehmer',
+    '/api/termine/1/protokolle',
+    '/api/termine/1/auftraege',
+    '/api/auftrag/1/positionen',
+    '/api/auftrag/1/summary',
+    '/api/protokoll/1/anhaenge',
+]
+
+_LOOKUP = re.compile(r'\b(WHERE|JOIN)\b', re.IGNORECASE)
+# SQLite: "SCAN Teilnehmer" is a full scan, "SCAN Termine USING INDEX ..." is not
+_SQLITE_FULL_SCAN = re.compile(r'^SCAN (\S+)(?: AS \S+)?$')
+
+
+def full_scans(connection, statement: str, parameters) -> list:
+    """Tables a statement reads with a full table scan."""
+    if connection.dialect.name == 'sqlite':
+        plan = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+        return [match.group(1) for match in (_SQLITE_FULL_SCAN.match(row[3]) for row in plan) if match]
+    plan = connection.exec_driver_sql('EXPLAIN ' + statement, parameters).mappings().all()
+    return [row['table'] for row in plan if row['type'] == 'ALL']
+
+
+def capture_statements(app, engine, path: str) -> list:
+    """Send a GET request and return the (statement, parameters) it executed."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            statements.append((statement, parameters))
+
+    sqlalchemy.event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = app.test_client().get(path)
+    finally:
+        sqlalchemy.event.remove(engine, 'before_cursor_execute', record)
+    if response.status_code >= 500:
+        raise RuntimeError(f"GET {path} failed with {response.status_code}: {response.get_data(as_text=True)}")
+    return statements
+
+
+def check(engine, requests=EXPLAIN_REQUESTS) -> list:
+    """
+    Run the check.
+
+    Returns:
+        list: (path, table, statement) for every full scan found
+    """
+    from backend.app import create_app
+    app = create_app({"DATABASE_ENGINE": engine, "TESTING": True, "REQUEST_TIMING": False, "METRICS": False})
+
+    findings = []
+    for path in requests:
+        for statement, parameters in capture_statements(app, engine, path):
+            if not _LOOKUP.search(statement):
+                continue
+            with engine.connect() as connection:
+                for table in full_scans(connection, statement, parameters):
+                    findings.append((path, table, statement))
+    return findings
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="main.py explain", description="Report API lookups that do not use an index.")
+    parser.add_argument('--url', help="database URL to check instead of the Aiven database from .env")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from backend.migrations import connect
+    args = parse_args(argv)
+    findings = check(connect(args.url))
+    for path, table, statement in findings:
+        print(f"GET {path}: full scan of {table}")
+        print(f"    {' '.join(statement.split())}")
+    if findings:
+        print(f"{len(findings)} full table scan(s) found.")
+        sys.exit(1)
+    print(f"All lookups of {len(EXPLAIN_REQUESTS)} requests use an index.")
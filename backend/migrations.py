@@ -0,0 +1,184 @@
+'''
+Versioned schema migrations.
+
+Usage:
+    python main.py migrate [--status] [--dry-run] [--url URL]
+
+Every migration has a version number and is applied once; the applied
+versions are recorded in the table "SchemaMigration". Migrations only add
+what is missing (tables, indexes), so they can also run on databases that
+were created from tables.sql.
+
+New schema changes are appended to MIGRATIONS with the next version number
+and mirrored in tables.py and tables.sql. Applied migrations are never changed.
+'''
+
+import argparse
+from datetime import datetime
+
+import sqlalchemy
+
+import backend.classes.tables as tables
+
+migration_metadata = sqlalchemy.MetaData()
+
+schema_migration = sqlalchemy.Table(
+    'SchemaMigration', migration_metadata,
+    sqlalchemy.Column('version', sqlalchemy.Integer, primary_key=True, autoincrement=False),
+    sqlalchemy.Column('name', sqlalchemy.String(255), nullable=False),
+    sqlalchemy.Column('applied_at', sqlalchemy.DateTime, nullable=False)
+)
+
+
+def create_index(connection, table: str, name: str, *columns: str):
+    """Create an index unless an index with the same name or the same columns exists."""
+    existing = sqlalchemy.inspect(connection).get_indexes(table)
+    if any(index['name'] == name or tuple(index['column_names']) == columns for index in existing):
+        return
+    table_object = tables.Base.metadata.tables[table]
+    sqlalchemy.Index(name, *(table_object.c[column] for column in columns)).create(connection)
+
+
+def create_tables(connection):
+    """
+    Create the tables of tables.py that do not exist yet, with the indexes of this migration.
+
+    The indexes are spelled out instead of taken from the model, so the migration
+    creates the same indexes when the model gains new ones later.
+    """
+    existing = set(sqlalchemy.inspect(connection).get_table_names())
+    created = set()
+    for table in tables.Base.metadata.sorted_tables:
+        if table.name not in existing:
+            # CREATE TABLE without the indexes of the model
+            connection.execute(sqlalchemy.schema.CreateTable(table))
+            created.add(table.name)
+    for table, name, *columns in (
+        ('Person', 'ix_Person_Adresse', 'Adresse'),
+        ('Unternehmen', 'ix_Unternehmen_Adresse', 'Adresse'),
+        ('Kontakt', 'ix_Kontakt_PersonId', 'PersonId'),
+        ('Kontakt', 'ix_Kontakt_UnternehmenId', 'UnternehmenId'),
+        ('Termine', 'ix_Termine_Ort', 'Ort'),
+        ('Termine', 'ix_Termine_Art', 'Art'),
+        ('Termine', 'ix_Termine_Ende', 'Ende'),
+        ('Termine', 'ix_Termine_Uid', 'Uid'),
+        ('Termine', 'ix_Termine_Start_Ende', 'Start', 'Ende'),
+        ('Protokoll', 'ix_Protokoll_Termin', 'Termin'),
+        ('Teilnehmer', 'ix_Teilnehmer_Kontakt', 'Kontakt'),
+        ('Teilnehmer', 'ix_Teilnehmer_Termin', 'Termin'),
+        ('Anhang', 'ix_Anhang_Protokoll', 'Protokoll'),
+        ('Anhang', 'ix_Anhang_Medium', 'Medium'),
+        ('Auftrag', 'ix_Auftrag_wichtigkeit', 'wichtigkeit'),
+        ('Auftrag', 'ix_Auftrag_Kontakt', 'Kontakt'),
+        ('Auftrag', 'ix_Auftrag_terminid', 'terminid'),
+        ('Auftragsposition', 'ix_Auftragsposition_Auftrag', 'Auftrag'),
+        ('Auftragsposition', 'ix_Auftragsposition_Produkt', 'Produkt'),
+    ):
+        # Like create_all: tables that already existed keep their indexes (see migration 2)
+        if table in created:
+            create_index(connection, table, name, *columns)
+
+
+def add_lookup_indexes(connection):
+    """Index every foreign key column and the filter columns of /api/termine."""
+    for table, column in (
+        ('Person', 'Adresse'),
+        ('Unternehmen', 'Adresse'),
+        ('Kontakt', 'PersonId'),
+        ('Kontakt', 'UnternehmenId'),
+        ('Termine', 'Ort'),
+        ('Termine', 'Art'),
+        ('Termine', 'Ende'),
+        ('Termine', 'Uid'),
+        ('Protokoll', 'Termin'),
+        ('Teilnehmer', 'Kontakt'),
+        ('Teilnehmer', 'Termin'),
+        ('Anhang', 'Protokoll'),
+        ('Anhang', 'Medium'),
+        ('Auftrag', 'wichtigkeit'),
+        ('Auftrag', 'Kontakt'),
+        ('Auftrag', 'terminid'),
+        ('Auftragsposition', 'Auftrag'),
+        ('Auftragsposition', 'Produkt'),
+    ):
+        create_index(connection, table, f'ix_{table}_{column}', column)
+    create_index(connection, 'Termine', 'ix_Termine_Start_Ende', 'Start', 'Ende')
+
+
+# (version, name, function(connection)), in the order they are applied
+MIGRATIONS = [
+    (1, 'create tables', create_tables),
+    (2, 'lookup indexes', add_lookup_indexes),
+]
+
+
+def applied_versions(connection) -> set:
+    """Versions recorded in SchemaMigration (created if missing)."""
+    migration_metadata.create_all(connection, checkfirst=True)
+    return set(connection.execute(sqlalchemy.select(schema_migration.c.version)).scalars())
+
+
+def pending_migrations(engine) -> list:
+    with engine.begin() as connection:
+        applied = applied_versions(connection)
+    return [migration for migration in MIGRATIONS if migration[0] not in applied]
+
+
+def migrate(engine, dry_run: bool = False) -> list:
+    """
+    Apply the pending migrations, each in its own transaction.
+
+    Note that MySQL commits DDL statements immediately, so a failed migration
+    may be partially applied; migrations only add missing objects and can be rerun.
+
+    Returns:
+        list: versions applied (or pending for a dry run)
+    """
+    applied = []
+    for version, name, function in pending_migrations(engine):
+        print(f"{'Pending' if dry_run else 'Applying'} migration {version}: {name}")
+        if dry_run:
+            applied.append(version)
+            continue
+        with engine.begin() as connection:
+            function(connection)
+            connection.execute(schema_migration.insert().values(version=version, name=name, applied_at=datetime.now()))
+        applied.append(version)
+    if not applied:
+        print("Schema is up to date.")
+    return applied
+
+
+def print_status(engine):
+    with engine.begin() as connection:
+        applied = applied_versions(connection)
+    for version, name, _ in MIGRATIONS:
+        print(f"{version:>4}  {'applied' if version in applied else 'pending':<8} {name}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="main.py migrate", description="Apply the schema migrations.")
+    parser.add_argument('--status', action='store_true', help="list the migrations and whether they are applied")
+    parser.add_argument('--dry-run', action='store_true', help="only list the pending migrations")
+    parser.add_argument('--url', help="database URL to migrate instead of the Aiven database from .env")
+    return parser.parse_args(argv)
+
+
+def connect(url: str = None):
+    """Engine for the given URL, or for the Aiven database configured in .env."""
+    if url:
+        return sqlalchemy.create_engine(url)
+    import backend.classes.aiven as aiven
+    engine = aiven.AivenDatabase().connect()
+    if engine is None:
+        raise RuntimeError("Database connection is not available")
+    return engine
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    engine = connect(args.url)
+    if args.status:
+        print_status(engine)
+    else:
+        migrate(engine, dry_run=args.dry_run)
@@ -1,201 +1,92 @@
-from flask import Blueprint, jsonify, request
+from decimal import Decimal
+
+from flask import jsonify, request
 import backend.classes.tables as tables
-from sqlalchemy import select
+from backend.classes.bulk import Field, parse_int
+from backend.classes.errors import internal_error
+from backend.classes.nested import init_nested_route
+from backend.classes.pagination import Page, PaginationError
+from backend.classes.resource import Resource, embed, lookup
+from backend.routes.auftragsposition import order_items
+from sqlalchemy import func, select
 
-auftrag_bp = Blueprint('auftrag', __name__, url_prefix='/api/auftrag')
+# Writable fields: JSON key -> column attribute
+FIELDS = {
+    'bezeichnung': Field('Bezeichnung'),
+    'wichtigkeit_id': Field('wichtigkeit', parse_int),
+    'kontakt_id': Field('Kontakt', parse_int),
+    'termin_id': Field('terminid', parse_int)
+}
+REQUIRED_FIELDS = ['bezeichnung', 'wichtigkeit_id', 'kontakt_id', 'termin_id']
 
+# Nested objects (for ?expand=): the contact without its reference
+RELATIONS = {
+    'wichtigkeit': lookup('wichtigkeit', tables.Wichtigkeit),
+    'kontakt': embed(tables.Auftrag.kontakt)
+}
 
-def init_routes(db):
-    """Initialize routes with database instance"""
-    
-    @auftrag_bp.route('', methods=['GET'])
-    def get_orders():
-        """Get all orders with resolved contact and importance data"""
-        try:
-            with db.session as session:
-                orders = session.execute(select(tables.Auftrag)).scalars().all()
-                result = []
-                for order in orders:
-                    order_data = {
-                        "id": order.id,
-                        "bezeichnung": order.Bezeichnung,
-                        "wichtigkeit_id": order.wichtigkeit,
-                        "kontakt_id": order.Kontakt,
-                        "termin_id": order.terminid
-                    }
-                    
-                    # Resolve Wichtigkeit foreign key
-                    wichtigkeit = session.execute(
-                        select(tables.Wichtigkeit).where(tables.Wichtigkeit.id == order.wichtigkeit)
-                    ).scalar_one_or_none()
-                    
-                    if wichtigkeit:
-                        order_data["wichtigkeit"] = {
-                            "id": wichtigkeit.id,
-                            "level": wichtigkeit.level
-                        }
-                    
-                    # Resolve Kontakt foreign key
-                    kontakt = session.execute(
-                        select(tables.Kontakt).where(tables.Kontakt.id == order.Kontakt)
-                    ).scalar_one_or_none()
-                    
-                    if kontakt:
-                        order_data["kontakt"] = {
-                            "id": kontakt.id,
-                            "email": kontakt.EMail,
-                            "telefonnummer": kontakt.Telefonnummer,
-                            "rolle": kontakt.Rolle,
-                            "person_id": kontakt.PersonId,
-                            "unternehmen_id": kontakt.UnternehmenId,
-                            "ref_typ": kontakt.RefTyp
-                        }
-                    
-                    result.append(order_data)
-                return jsonify({"orders": result, "count": len(result)}), 200
-        except Exception as e:
-            return jsonify({"error": str(e)}), 500
+orders = Resource('auftrag', tables.Auftrag, 'orders', "Order", FIELDS, REQUIRED_FIELDS, RELATIONS)
 
+# Number of items and total price per order, computed by the database
+# (orders without items have 0 items and a total of 0)
+order_summaries = (
+    select(
+        tables.Auftrag.id,
+        func.count(tables.Auftragsposition.id).label('item_count'),
+        func.coalesce(func.sum(tables.Produkt.Preis), 0).label('total')
+    )
+    .outerjoin(tables.Auftragsposition, tables.Auftragsposition.Auftrag == tables.Auftrag.id)
+    .outerjoin(tables.Produkt, tables.Produkt.id == tables.Auftragsposition.Produkt)
+    .group_by(tables.Auftrag.id)
+)
 
-    @auftrag_bp.route('/<int:order_id>', methods=['GET'])
-    def get_order(order_id):
-        """Get a single order by ID with resolved contact and importance data"""
-        try:
-            with db.session as session:
-                order = session.execute(
-                    select(tables.Auftrag).where(tables.Auftrag.id == order_id)
-                ).scalar_one_or_none()
-                
-                if order:
-                    order_data = {
-                        "id": order.id,
-                        "bezeichnung": order.Bezeichnung,
-                        "wichtigkeit_id": order.wichtigkeit,
-                        "kontakt_id": order.Kontakt,
-                        "termin_id": order.terminid
-                    }
-                    
-                    # Resolve Wichtigkeit foreign key
-                    wichtigkeit = session.execute(
-                        select(tables.Wichtigkeit).where(tables.Wichtigkeit.id == order.wichtigkeit)
-                    ).scalar_one_or_none()
-                    
-                    if wichtigkeit:
-                        order_data["wichtigkeit"] = {
-                            "id": wichtigkeit.id,
-                            "level": wichtigkeit.level
-                        }
-                    
-                    # Resolve Kontakt foreign key
-                    kontakt = session.execute(
-                        select(tables.Kontakt).where(tables.Kontakt.id == order.Kontakt)
-                    ).scalar_one_or_none()
-                    
-                    if kontakt:
-                        order_data["kontakt"] = {
-                            "id": kontakt.id,
-                            "email": kontakt.EMail,
-                            "telefonnummer": kontakt.Telefonnummer,
-                            "rolle": kontakt.Rolle,
-                            "person_id": kontakt.PersonId,
-                            "unternehmen_id": kontakt.UnternehmenId,
-                            "ref_typ": kontakt.RefTyp
-                        }
-                    
-                    return jsonify(order_data), 200
-                else:
-                    return jsonify({"error": "Order not found"}), 404
-        except Exception as e:
-            return jsonify({"error": str(e)}), 500
 
+def serialize_summary(row):
+    """Serialize an order summary row, the total as a Decimal encoded like the prices (JSON_DECIMAL)"""
+    return {
+        "id": row.id,
+        "item_count": row.item_count,
+        # str() keeps the digits of databases returning the sum as a float or an int
+        "total": Decimal(str(row.total))
+    }
 
-    @auftrag_bp.route('', methods=['POST'])
-    def create_order():
-        """Create a new order"""
-        try:
-            data = request.get_json()
-            
-            # Validate required fields
-            if not all(key in data for key in ['bezeichnung', 'wichtigkeit_id', 'kontakt_id', 'termin_id']):
-                return jsonify({"error": "Missing required fields"}), 400
-            
-            with db.session as session:
-                new_order = tables.Auftrag(
-                    Bezeichnung=data['bezeichnung'],
-                    wichtigkeit=data['wichtigkeit_id'],
-                    Kontakt=data['kontakt_id'],
-                    terminid=data['termin_id']
-                )
-                session.add(new_order)
-                session.commit()
-                session.refresh(new_order)
-                
-                return jsonify({
-                    "id": new_order.id,
-                    "bezeichnung": new_order.Bezeichnung,
-                    "wichtigkeit_id": new_order.wichtigkeit,
-                    "kontakt_id": new_order.Kontakt,
-                    "termin_id": new_order.terminid
-                }), 201
-        except Exception as e:
-            return jsonify({"error": str(e)}), 500
 
+def init_routes(db):
+    """Initialize routes with database instance"""
+    auftrag_bp = orders.blueprint(db)
 
-    @auftrag_bp.route('/<int:order_id>', methods=['PUT'])
-    def update_order(order_id):
-        """Update an existing order"""
+    @auftrag_bp.route('/summary', methods=['GET'])
+    def get_order_summaries():
+        """Get the number of items and the total price of all orders"""
         try:
-            data = request.get_json()
-            
+            page = Page.from_args(request.args)
             with db.session as session:
-                order = session.execute(
-                    select(tables.Auftrag).where(tables.Auftrag.id == order_id)
-                ).scalar_one_or_none()
-                
-                if not order:
-                    return jsonify({"error": "Order not found"}), 404
-                
-                # Update fields if provided
-                if 'bezeichnung' in data:
-                    order.Bezeichnung = data['bezeichnung']
-                if 'wichtigkeit_id' in data:
-                    order.wichtigkeit = data['wichtigkeit_id']
-                if 'kontakt_id' in data:
-                    order.Kontakt = data['kontakt_id']
-                if 'termin_id' in data:
-                    order.terminid = data['termin_id']
-                
-                session.commit()
-                session.refresh(order)
-                
-                return jsonify({
-                    "id": order.id,
-                    "bezeichnung": order.Bezeichnung,
-                    "wichtigkeit_id": order.wichtigkeit,
-                    "kontakt_id": order.Kontakt,
-                    "termin_id": order.terminid
-                }), 200
+                summaries = session.execute(page.apply(order_summaries, tables.Auftrag.id)).all()
+                summaries, next_cursor = page.split(summaries)
+                result = [serialize_summary(row) for row in summaries]
+                return jsonify({"summaries": result, "count": len(result), "next_cursor": next_cursor}), 200
+        except PaginationError as e:
+            return jsonify({"error": str(e)}), 400
         except Exception as e:
-            return jsonify({"error": str(e)}), 500
+            return internal_error(e)
 
 
-    @auftrag_bp.route('/<int:order_id>', methods=['DELETE'])
-    def delete_order(order_id):
-        """Delete an order"""
+    @auftrag_bp.route('/<int:order_id>/summary', methods=['GET'])
+    def get_order_summary(order_id):
+        """Get the number of items and the total price of an order"""
         try:
             with db.session as session:
-                order = session.execute(
-                    select(tables.Auftrag).where(tables.Auftrag.id == order_id)
-                ).scalar_one_or_none()
-                
-                if not order:
+                summary = session.execute(
+                    order_summaries.where(tables.Auftrag.id == order_id)
+                ).one_or_none()
+
+                if summary:
+                    return jsonify(serialize_summary(summary)), 200
+                else:
                     return jsonify({"error": "Order not found"}), 404
-                
-                session.delete(order)
-                session.commit()
-                
-                return jsonify({"message": "Order deleted successfully"}), 200
         except Exception as e:
-            return jsonify({"error": str(e)}), 500
-    
+            return internal_error(e)
+
+    init_nested_route(auftrag_bp, db, 'positionen', tables.Auftrag, tables.Auftragsposition.Auftrag, order_items.list_items, "Order not found")
+
     return auftrag_bp
@@ -1,212 +1,61 @@
-from flask import Blueprint, jsonify, request
+from io import BytesIO
+
+from flask import jsonify, send_file
 import backend.classes.tables as tables
+from backend.classes.bulk import Field, parse_datetime, parse_int
+from backend.classes.conditional import compute_etag
+from backend.classes.errors import internal_error
+from backend.classes.nested import init_nested_route
+from backend.classes.resource import Resource, embed
+from backend.routes.anhang import attachments
 from sqlalchemy import select
-from datetime import datetime
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
+
+# Writable fields: JSON key -> column attribute
+FIELDS = {
+    'datum': Field('Datum', parse_datetime),
+    'text': Field('Text'),
+    'dauer': Field('Dauer', parse_int),
+    'tldr': Field('TLDR'),
+    'termin_id': Field('Termin', parse_int)
+}
+REQUIRED_FIELDS = ['datum', 'text', 'dauer', 'tldr', 'termin_id']
+# Only listed when requested with ?fields=, the full text is served by /<id>/text
+DEFERRED_FIELDS = ['text']
+
+# Nested objects (for ?expand=): the appointment with its type
+RELATIONS = {
+    'termin': embed(tables.Protokoll.termin, expand=['art'])
+}
 
-protokoll_bp = Blueprint('protokoll', __name__, url_prefix='/api/protokoll')
+protocols = Resource('protokoll', tables.Protokoll, 'protocols', "Protocol", FIELDS, REQUIRED_FIELDS, RELATIONS,
+                     deferred=DEFERRED_FIELDS)
 
 
 def init_routes(db):
     """Initialize routes with database instance"""
-    
-    @protokoll_bp.route('', methods=['GET'])
-    def get_protocols():
-        """Get all protocols with resolved appointment data"""
-        try:
-            with db.session as session:
-                protocols = session.execute(select(tables.Protokoll)).scalars().all()
-                result = []
-                for protocol in protocols:
-                    # Resolve Termine foreign key
-                    termin = session.execute(
-                        select(tables.Termine).where(tables.Termine.id == protocol.Termin)
-                    ).scalar_one_or_none()
-                    
-                    protocol_data = {
-                        "id": protocol.id,
-                        "datum": protocol.Datum.isoformat() if protocol.Datum else None,
-                        "text": protocol.Text,
-                        "dauer": protocol.Dauer,
-                        "tldr": protocol.TLDR,
-                        "termin_id": protocol.Termin
-                    }
-                    
-                    if termin:
-                        # Also resolve Terminart for the termin
-                        art = session.execute(
-                            select(tables.Terminart).where(tables.Terminart.id == termin.Art)
-                        ).scalar_one_or_none()
-                        
-                        protocol_data["termin"] = {
-                            "id": termin.id,
-                            "title": termin.Titel,
-                            "ort": termin.Ort,
-                            "art_id": termin.Art,
-                            "start": termin.Start.isoformat() if termin.Start else None,
-                            "ende": termin.Ende.isoformat() if termin.Ende else None,
-                            "uid": termin.Uid
-                        }
-                        
-                        if art:
-                            protocol_data["termin"]["art"] = {
-                                "id": art.id,
-                                "name": art.Name
-                            }
-                    
-                    result.append(protocol_data)
-                return jsonify({"protocols": result, "count": len(result)}), 200
-        except Exception as e:
-            return jsonify({"error": str(e)}), 500
-
+    protokoll_bp = protocols.blueprint(db)
 
-    @protokoll_bp.route('/<int:protocol_id>', methods=['GET'])
-    def get_protocol(protocol_id):
-        """Get a single protocol by ID with resolved appointment data"""
+    @protokoll_bp.route('/<int:protocol_id>/text', methods=['GET'])
+    def get_protocol_text(protocol_id):
+        """Get the text of a protocol as text/plain, supports Range requests"""
         try:
             with db.session as session:
-                protocol = session.execute(
-                    select(tables.Protokoll).where(tables.Protokoll.id == protocol_id)
+                text = session.execute(
+                    select(tables.Protokoll.Text).where(tables.Protokoll.id == protocol_id)
                 ).scalar_one_or_none()
-                
-                if protocol:
-                    # Resolve Termine foreign key
-                    termin = session.execute(
-                        select(tables.Termine).where(tables.Termine.id == protocol.Termin)
-                    ).scalar_one_or_none()
-                    
-                    protocol_data = {
-                        "id": protocol.id,
-                        "datum": protocol.Datum.isoformat() if protocol.Datum else None,
-                        "text": protocol.Text,
-                        "dauer": protocol.Dauer,
-                        "tldr": protocol.TLDR,
-                        "termin_id": protocol.Termin
-                    }
-                    
-                    if termin:
-                        # Also resolve Terminart for the termin
-                        art = session.execute(
-                            select(tables.Terminart).where(tables.Terminart.id == termin.Art)
-                        ).scalar_one_or_none()
-                        
-                        protocol_data["termin"] = {
-                            "id": termin.id,
-                            "title": termin.Titel,
-                            "ort": termin.Ort,
-                            "art_id": termin.Art,
-                            "start": termin.Start.isoformat() if termin.Start else None,
-                            "ende": termin.Ende.isoformat() if termin.Ende else None,
-                            "uid": termin.Uid
-                        }
-                        
-                        if art:
-                            protocol_data["termin"]["art"] = {
-                                "id": art.id,
-                                "name": art.Name
-                            }
-                    
-                    return jsonify(protocol_data), 200
-                else:
-                    return jsonify({"error": "Protocol not found"}), 404
-        except Exception as e:
-            return jsonify({"error": str(e)}), 500
-
-
-    @protokoll_bp.route('', methods=['POST'])
-    def create_protocol():
-        """Create a new protocol"""
-        try:
-            data = request.get_json()
-            
-            # Validate required fields
-            if not all(key in data for key in ['datum', 'text', 'dauer', 'tldr', 'termin_id']):
-                return jsonify({"error": "Missing required fields"}), 400
-            
-            with db.session as session:
-                # Parse datetime
-                datum = datetime.fromisoformat(data['datum'])
-                
-                new_protocol = tables.Protokoll(
-                    Datum=datum,
-                    Text=data['text'],
-                    Dauer=data['dauer'],
-                    TLDR=data['tldr'],
-                    Termin=data['termin_id']
-                )
-                session.add(new_protocol)
-                session.commit()
-                session.refresh(new_protocol)
-                
-                return jsonify({
-                    "id": new_protocol.id,
-                    "datum": new_protocol.Datum.isoformat(),
-                    "text": new_protocol.Text,
-                    "dauer": new_protocol.Dauer,
-                    "tldr": new_protocol.TLDR,
-                    "termin_id": new_protocol.Termin
-                }), 201
-        except Exception as e:
-            return jsonify({"error": str(e)}), 500
 
+            if text is None:
+                return jsonify({"error": "Protocol not found"}), 404
 
-    @protokoll_bp.route('/<int:protocol_id>', methods=['PUT'])
-    def update_protocol(protocol_id):
-        """Update an existing protocol"""
-        try:
-            data = request.get_json()
-            
-            with db.session as session:
-                protocol = session.execute(
-                    select(tables.Protokoll).where(tables.Protokoll.id == protocol_id)
-                ).scalar_one_or_none()
-                
-                if not protocol:
-                    return jsonify({"error": "Protocol not found"}), 404
-                
-                # Update fields if provided
-                if 'datum' in data:
-                    protocol.Datum = datetime.fromisoformat(data['datum'])
-                if 'text' in data:
-                    protocol.Text = data['text']
-                if 'dauer' in data:
-                    protocol.Dauer = data['dauer']
-                if 'tldr' in data:
-                    protocol.TLDR = data['tldr']
-                if 'termin_id' in data:
-                    protocol.Termin = data['termin_id']
-                
-                session.commit()
-                session.refresh(protocol)
-                
-                return jsonify({
-                    "id": protocol.id,
-                    "datum": protocol.Datum.isoformat(),
-                    "text": protocol.Text,
-                    "dauer": protocol.Dauer,
-                    "tldr": protocol.TLDR,
-                    "termin_id": protocol.Termin
-                }), 200
+            body = text.encode('utf-8')
+            # Sent in chunks; answers Range / If-Range with 206 and If-None-Match with 304
+            return send_file(BytesIO(body), mimetype='text/plain', etag=compute_etag(body), conditional=True)
+        except RequestedRangeNotSatisfiable:
+            raise
         except Exception as e:
-            return jsonify({"error": str(e)}), 500
+            return internal_error(e)
 
-
-    @protokoll_bp.route('/<int:protocol_id>', methods=['DELETE'])
-    def delete_protocol(protocol_id):
-        """Delete a protocol"""
-        try:
-            with db.session as session:
-                protocol = session.execute(
-                    select(tables.Protokoll).where(tables.Protokoll.id == protocol_id)
-                ).scalar_one_or_none()
-                
-                if not protocol:
-                    return jsonify({"error": "Protocol not found"}), 404
-                
-                session.delete(protocol)
-                session.commit()
-                
-                return jsonify({"message": "Protocol deleted successfully"}), 200
-        except Exception as e:
-            return jsonify({"error": str(e)}), 500
+    init_nested_route(protokoll_bp, db, 'anhaenge', tables.Protokoll, tables.Anhang.Protokoll, attachments.list_items, "Protocol not found")
     
     return protokoll_bp
@@ -1,199 +1,157 @@
-from flask import Blueprint, jsonify, request
+import operator
+from datetime import timezone
+
+from flask import jsonify, request
 import backend.classes.tables as tables
-from sqlalchemy import select
-from datetime import datetime
+from backend.classes.bulk import Field, parse_datetime, parse_int
+from backend.classes.errors import internal_error
+from backend.classes.filtering import Filter, FilterError
+from backend.classes.nested import init_nested_route
+from backend.classes.resource import Resource, lookup
+from backend.routes.auftrag import orders
+from backend.routes.kontakt import contacts
+from backend.routes.protokoll import protocols
+from backend.routes.teilnehmer import participants
+from sqlalchemy import and_, func, select
 
-termine_bp = Blueprint('termine', __name__, url_prefix='/api/termine')
+# Writable fields: JSON key -> column attribute
+FIELDS = {
+    'title': Field('Titel'),
+    'ort': Field('Ort'),
+    'art_id': Field('Art', parse_int),
+    'start': Field('Start', parse_datetime),
+    'ende': Field('Ende', parse_datetime),
+    'uid': Field('Uid')
+}
+REQUIRED_FIELDS = ['title', 'ort', 'art_id', 'start', 'ende', 'uid']
 
+# The importance of an appointment is the one of its first order (lowest id),
+# -1 if it has no order or the order has no importance. Correlated, so only the
+# orders of the selected appointments are read (index on Auftrag.terminid)
+first_order_importance = (
+    select(tables.Auftrag.wichtigkeit)
+    .where(tables.Auftrag.terminid == tables.Termine.id)
+    .order_by(tables.Auftrag.id)
+    .limit(1)
+    .correlate(tables.Termine)
+    .scalar_subquery()
+)
+wichtigkeit_id = func.coalesce(first_order_importance, -1).label('wichtigkeit_id')
 
-def init_routes(db):
-    """Initialize routes with database instance"""
-    
-    @termine_bp.route('', methods=['GET'])
-    def get_appointments():
-        """Get all appointments with resolved appointment type data"""
-        try:
-            with db.session as session:
-                appointments = session.execute(select(tables.Termine)).scalars().all()
-                orders = session.execute(select(tables.Auftrag)).scalars().all()
-                result = []
-                for appointment in appointments:
-                    # Resolve Terminart foreign key
-                    art = session.execute(
-                        select(tables.Terminart).where(tables.Terminart.id == appointment.Art)
-                    ).scalar_one_or_none()
-                    
-                    appointment_data = {
-                        "id": appointment.id,
-                        "title": appointment.Titel,
-                        "ort": appointment.Ort,
-                        "art_id": appointment.Art,
-                        "start": appointment.Start.isoformat() if appointment.Start else None,
-                        "ende": appointment.Ende.isoformat() if appointment.Ende else None,
-                        "uid": appointment.Uid
-                    }
-                    
-                    if art:
-                        appointment_data["art"] = {
-                            "id": art.id,
-                            "name": art.Name
-                        }
-
-                    appointment_data["wichtigkeit_id"] = -1
-
-                    for order in orders:
-                        if order.terminid == appointment.id:
-                            if order.wichtigkeit:
-                                appointment_data["wichtigkeit_id"] = order.wichtigkeit
-                            break
-                    
-                    result.append(appointment_data)
-                result.sort(key=lambda x: (-x.get("wichtigkeit_id", -1), x.get("start") or ""))
+# Nested objects (for ?expand=)
+RELATIONS = {
+    'art': lookup('Art', tables.Terminart)
+}
 
-                return jsonify({"appointments": result, "count": len(result)}), 200
-        except Exception as e:
-            return jsonify({"error": str(e)}), 500
+def parse_query_datetime(value):
+    """Parse an ISO 8601 datetime of a query parameter; one with an offset (e.g. "Z") is converted to naive UTC like the stored times"""
+    value = parse_datetime(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
 
 
-    @termine_bp.route('/<int:appointment_id>', methods=['GET'])
-    def get_appointment(appointment_id):
-        """Get a single appointment by ID with resolved appointment type data"""
-        try:
-            with db.session as session:
-                appointment = session.execute(
-                    select(tables.Termine).where(tables.Termine.id == appointment_id)
-                ).scalar_one_or_none()
-                
-                if appointment:
-                    # Resolve Terminart foreign key
-                    art = session.execute(
-                        select(tables.Terminart).where(tables.Terminart.id == appointment.Art)
-                    ).scalar_one_or_none()
-                    
-                    appointment_data = {
-                        "id": appointment.id,
-                        "title": appointment.Titel,
-                        "ort": appointment.Ort,
-                        "art_id": appointment.Art,
-                        "start": appointment.Start.isoformat() if appointment.Start else None,
-                        "ende": appointment.Ende.isoformat() if appointment.Ende else None,
-                        "uid": appointment.Uid
-                    }
-                    
-                    if art:
-                        appointment_data["art"] = {
-                            "id": art.id,
-                            "name": art.Name
-                        }
-                    
-                    return jsonify(appointment_data), 200
-                else:
-                    return jsonify({"error": "Appointment not found"}), 404
-        except Exception as e:
-            return jsonify({"error": str(e)}), 500
+# Query parameter filters of the listing: from/to select the appointments
+# starting at or after "from" and ending at or before "to". An appointment
+# cannot start after its end, so "to" also bounds Start and a request with
+# both only reads the index range of Start between them
+FILTERS = {
+    'from': Filter(tables.Termine.Start, operator.ge, parse_query_datetime),
+    'to': Filter(tables.Termine.Ende, lambda ende, value: and_(ende <= value, tables.Termine.Start <= value), parse_query_datetime),
+    'art_id': Filter(tables.Termine.Art, parse=int),
+    'ort': Filter(tables.Termine.Ort),
+    'uid': Filter(tables.Termine.Uid)
+}
 
 
-    @termine_bp.route('', methods=['POST'])
-    def create_appointment():
-        """Create a new appointment"""
-        try:
-            data = request.get_json()
-            
-            # Validate required fields
-            if not all(key in data for key in ['title', 'ort', 'art_id', 'start', 'ende', 'uid']):
-                return jsonify({"error": "Missing required fields"}), 400
-            
-            with db.session as session:
-                # Parse datetime
-                start = datetime.fromisoformat(data['start'])
-                ende = datetime.fromisoformat(data['ende'])
-                
-                new_appointment = tables.Termine(
-                    Titel=data['title'],
-                    Ort=data['ort'],
-                    Art=data['art_id'],
-                    Start=start,
-                    Ende=ende,
-                    Uid=data['uid']
-                )
-                session.add(new_appointment)
-                session.commit()
-                session.refresh(new_appointment)
-                
-                return jsonify({
-                    "id": new_appointment.id,
-                    "title": new_appointment.Titel,
-                    "ort": new_appointment.Ort,
-                    "art_id": new_appointment.Art,
-                    "start": new_appointment.Start.isoformat(),
-                    "ende": new_appointment.Ende.isoformat(),
-                    "uid": new_appointment.Uid
-                }), 201
-        except Exception as e:
-            return jsonify({"error": str(e)}), 500
+def parse_window(args):
+    """
+    Parse the start and end of a calendar window.
 
+    Raises:
+        FilterError: if start or end are missing or invalid, or end is not after start
+    """
+    if 'start' not in args or 'end' not in args:
+        raise FilterError("start and end are required")
+    try:
+        start = parse_query_datetime(args['start'])
+        end = parse_query_datetime(args['end'])
+    except ValueError:
+        raise FilterError("start and end must be ISO 8601 datetimes")
+    if end <= start:
+        raise FilterError("end must be after start")
+    return start, end
+
+
+def serialize_participant(participant, contact_data=None):
+    """Serialize a participant of an appointment and, if given, its serialized contact"""
+    participant_data = participants.serialize_fields(participant)
+    if contact_data is not None:
+        participant_data["kontakt"] = contact_data
+    return participant_data
 
-    @termine_bp.route('/<int:appointment_id>', methods=['PUT'])
-    def update_appointment(appointment_id):
-        """Update an existing appointment"""
-        try:
-            data = request.get_json()
-            
-            with db.session as session:
-                appointment = session.execute(
-                    select(tables.Termine).where(tables.Termine.id == appointment_id)
-                ).scalar_one_or_none()
-                
-                if not appointment:
-                    return jsonify({"error": "Appointment not found"}), 404
-                
-                # Update fields if provided
-                if 'title' in data:
-                    appointment.Titel = data['title']
-                if 'ort' in data:
-                    appointment.Ort = data['ort']
-                if 'art_id' in data:
-                    appointment.Art = data['art_id']
-                if 'start' in data:
-                    appointment.Start = datetime.fromisoformat(data['start'])
-                if 'ende' in data:
-                    appointment.Ende = datetime.fromisoformat(data['ende'])
-                if 'uid' in data:
-                    appointment.Uid = data['uid']
-                
-                session.commit()
-                session.refresh(appointment)
-                
-                return jsonify({
-                    "id": appointment.id,
-                    "title": appointment.Titel,
-                    "ort": appointment.Ort,
-                    "art_id": appointment.Art,
-                    "start": appointment.Start.isoformat(),
-                    "ende": appointment.Ende.isoformat(),
-                    "uid": appointment.Uid
-                }), 200
-        except Exception as e:
-            return jsonify({"error": str(e)}), 500
 
+# Listed by importance (descending), then by start
+appointments = Resource('termine', tables.Termine, 'appointments', "Appointment", FIELDS, REQUIRED_FIELDS, RELATIONS,
+                        filters=FILTERS, computed=[wichtigkeit_id],
+                        order_by=(wichtigkeit_id.desc(), tables.Termine.Start, tables.Termine.id))
+
+
+def init_routes(db):
+    """Initialize routes with database instance"""
+    termine_bp = appointments.blueprint(db)
 
-    @termine_bp.route('/<int:appointment_id>', methods=['DELETE'])
-    def delete_appointment(appointment_id):
-        """Delete an appointment"""
+    @termine_bp.route('/window', methods=['GET'])
+    def get_appointment_window():
+        """Get the appointments overlapping [start, end) with their participants and contacts"""
         try:
+            start, end = parse_window(request.args)
+            # Range on the (Start, Ende) index, Ende is checked on the index entries
+            overlapping = and_(tables.Termine.Start < end, tables.Termine.Ende > start)
+            # Column rows instead of ORM objects, a year can hold thousands of appointments
             with db.session as session:
-                appointment = session.execute(
-                    select(tables.Termine).where(tables.Termine.id == appointment_id)
-                ).scalar_one_or_none()
-                
-                if not appointment:
-                    return jsonify({"error": "Appointment not found"}), 404
-                
-                session.delete(appointment)
-                session.commit()
-                
-                return jsonify({"message": "Appointment deleted successfully"}), 200
+                appointment_rows = session.execute(
+                    select(*appointments.columns)
+                    .where(overlapping)
+                    .order_by(tables.Termine.Start, tables.Termine.id)
+                ).all()
+                # The participants and contacts of all appointments in the window with one
+                # statement each, joined with the same condition instead of an IN list of ids
+                participant_rows = session.execute(
+                    select(*participants.columns)
+                    .join(tables.Termine, tables.Teilnehmer.Termin == tables.Termine.id)
+                    .where(overlapping)
+                    .order_by(tables.Termine.Start, tables.Teilnehmer.id)
+                ).all()
+                contact_rows = session.execute(
+                    select(*contacts.columns).where(tables.Kontakt.id.in_(
+                        select(tables.Teilnehmer.Kontakt)
+                        .join(tables.Termine, tables.Teilnehmer.Termin == tables.Termine.id)
+                        .where(overlapping)
+                    ))
+                ).all()
+
+                # Every contact is serialized once, even if it takes part in many appointments
+                contacts_by_id = {contact.id: contacts.serialize_fields(contact) for contact in contact_rows}
+                participants_by_appointment = {}
+                for participant in participant_rows:
+                    participants_by_appointment.setdefault(participant.Termin, []).append(
+                        serialize_participant(participant, contacts_by_id.get(participant.Kontakt))
+                    )
+
+                result = []
+                for appointment in appointment_rows:
+                    appointment_data = appointments.serialize_item(appointment)
+                    appointment_data["teilnehmer"] = participants_by_appointment.get(appointment.id, [])
+                    result.append(appointment_data)
+                return jsonify({"appointments": result, "count": len(result)}), 200
+        except FilterError as e:
+            return jsonify({"error": str(e)}), 400
         except Exception as e:
-            return jsonify({"error": str(e)}), 500
-    
+            return internal_error(e)
+
+    init_nested_route(termine_bp, db, 'teilnehmer', tables.Termine, tables.Teilnehmer.Termin, participants.list_items, "Appointment not found")
+    init_nested_route(termine_bp, db, 'protokolle', tables.Termine, tables.Protokoll.Termin, protocols.list_items, "Appointment not found")
+    init_nested_route(termine_bp, db, 'auftraege', tables.Termine, tables.Auftrag.terminid, orders.list_items, "Appointment not found")
+
     return termine_bp
@@ -0,0 +1,147 @@
+'''
+Production serving of the API with a WSGI or ASGI server.
+
+Usage:
+    python main.py serve [--workers N] [--threads M] [--host HOST] [--port PORT]
+                         [--server auto|gunicorn|waitress|uvicorn] [--url URL]
+
+gunicorn (Linux/macOS) runs N worker processes with M threads each.
+waitress (all platforms, including Windows) runs a single process with M threads.
+uvicorn runs a single process with an async database engine (see backend/asgi.py),
+which overlaps the database round trips of all requests in flight.
+'''
+
+import argparse
+import importlib.util
+import sys
+
+import sqlalchemy
+
+import backend.classes.aiven as aiven
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="main.py serve", description="Serve the API with a production WSGI or ASGI server.")
+    parser.add_argument('--host', default='0.0.0.0', help="interface to bind (default: 0.0.0.0)")
+    parser.add_argument('--port', type=int, default=5000, help="port to bind (default: 5000)")
+    parser.add_argument('--workers', type=int, default=2, help="worker processes, gunicorn only (default: 2)")
+    parser.add_argument('--threads', type=int, default=4, help="threads per worker (default: 4)")
+    parser.add_argument('--server', choices=['auto', 'gunicorn', 'waitress', 'uvicorn'], default='auto',
+                        help="server, auto prefers gunicorn where it is available; uvicorn serves "
+                             "the async mode and is only used when requested (default: auto)")
+    parser.add_argument('--url', help="database URL to serve instead of the Aiven database from .env, "
+                                      "with an async driver for uvicorn (e.g. sqlite+aiosqlite:///local.db)")
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.threads < 1:
+        parser.error("--workers and --threads must be at least 1")
+    return args
+
+
+def choose_server(requested: str) -> str:
+    """Pick the WSGI server, gunicorn is only available on POSIX systems."""
+    gunicorn = sys.platform != 'win32' and importlib.util.find_spec('gunicorn') is not None
+    waitress = importlib.util.find_spec('waitress') is not None
+    if requested == 'gunicorn' and not gunicorn:
+        raise RuntimeError("gunicorn is not available. Install it with '(uv) pip install gunicorn' (not supported on Windows).")
+    if requested == 'waitress' and not waitress:
+        raise RuntimeError("waitress is not available. Install it with '(uv) pip install waitress'.")
+    if requested == 'uvicorn' and importlib.util.find_spec('uvicorn') is None:
+        raise RuntimeError("uvicorn is not available. Install the async extra with 'uv sync --extra async'.")
+    if requested != 'auto':
+        return requested
+    if gunicorn:
+        return 'gunicorn'
+    if waitress:
+        return 'waitress'
+    raise RuntimeError("No WSGI server installed. Install the serve extra with 'uv sync --extra serve'.")
+
+
+def log_configuration(server: str, workers: int, threads: int, url: str = None):
+    """Print the effective worker and connection pool configuration."""
+    if server == 'uvicorn':
+        print("Serving with uvicorn: 1 process, requests overlap on the event loop")
+    else:
+        print(f"Serving with {server}: {workers} worker(s) x {threads} thread(s)")
+    if url:
+        print(f"Database: {sqlalchemy.engine.make_url(url).render_as_string(hide_password=True)}")
+        return
+
+    env = aiven.AivenEnvironment()
+    pool_size = env.get_pool_size()
+    max_overflow = env.get_pool_max_overflow()
+    print(f"Connection pool per worker: size {pool_size}, overflow {max_overflow}, "
+          f"timeout {env.get_pool_timeout()}s, recycle {env.get_pool_recycle()}s, pre-ping {env.get_pool_pre_ping()}")
+    print(f"Maximum database connections: {workers * (pool_size + max_overflow)}")
+    if server == 'uvicorn':
+        print(f"At most {pool_size + max_overflow} requests wait for the database at the same time, "
+              "the others wait for a free connection.")
+    elif threads > pool_size + max_overflow:
+        print(f"Warning: {threads} threads per worker but only {pool_size + max_overflow} pooled connections, "
+              "requests will wait for a free connection.")
+
+
+def app_config(url: str = None, asynchronous: bool = False) -> dict:
+    """create_app config for a database URL (None: the Aiven database from .env)."""
+    if not url:
+        return {}
+    if asynchronous:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        return {"DATABASE_ENGINE": create_async_engine(url)}
+    return {"DATABASE_ENGINE": sqlalchemy.create_engine(url)}
+
+
+def serve_gunicorn(host: str, port: int, workers: int, threads: int, url: str = None):
+    from gunicorn.app.base import BaseApplication
+
+    class Application(BaseApplication):
+
+        def __init__(self, options: dict):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # Created in each worker after the fork (preload_app is off), so every
+            # worker creates its own engine and connection pool
+            from backend.app import create_app
+            return create_app(app_config(url))
+
+    Application({
+        'bind': f"{host}:{port}",
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread',
+        'preload_app': False,
+    }).run()
+
+
+def serve_waitress(host: str, port: int, threads: int, url: str = None):
+    from waitress import serve as waitress_serve
+    from backend.app import create_app
+    waitress_serve(create_app(app_config(url)), host=host, port=port, threads=threads)
+
+
+def serve_uvicorn(host: str, port: int, url: str = None):
+    import uvicorn
+    from backend.asgi import create_asgi_app
+    uvicorn.run(create_asgi_app(app_config(url, asynchronous=True)), host=host, port=port, lifespan='on')
+
+
+def serve(argv=None):
+    args = parse_args(argv)
+    server = choose_server(args.server)
+    workers = args.workers
+    if server in ('waitress', 'uvicorn') and workers > 1:
+        print(f"{server} runs a single process, ignoring --workers.")
+        workers = 1
+
+    log_configuration(server, workers, args.threads, args.url)
+    if server == 'gunicorn':
+        serve_gunicorn(args.host, args.port, workers, args.threads, args.url)
+    elif server == 'uvicorn':
+        serve_uvicorn(args.host, args.port, args.url)
+    else:
+        serve_waitress(args.host, args.port, args.threads, args.url)
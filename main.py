@@ -19,13 +19,31 @@ def test():
             print("No product found with ID 1.")
 
 def main():
-    from backend.app import app
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    from backend.app import create_app
+    create_app().run(debug=True, host='0.0.0.0', port=5000)
+
+def serve():
+    from backend.server import serve
+    serve(sys.argv[2:])
+
+def migrate():
+    from backend.migrations import main as migrate_main
+    migrate_main(sys.argv[2:])
+
+def explain():
+    from backend.explain import main as explain_main
+    explain_main(sys.argv[2:])
 
 
 
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "test":
         test()
+    elif len(sys.argv) > 1 and sys.argv[1] == "serve":
+        serve()
+    elif len(sys.argv) > 1 and sys.argv[1] == "migrate":
+        migrate()
+    elif len(sys.argv) > 1 and sys.argv[1] == "explain":
+        explain()
     else:
         main()
@@ -0,0 +1,68 @@
+'''
+Creating many contacts: single POSTs against one bulk POST.
+
+Usage:
+    python scripts/perf/bulk_insert.py [--root TREE] [--items 2000] [--latency-ms 0]
+
+Both runs use a fresh SQLite file (seeded with common.seed, 5 rows per
+table) so each POST pays a real commit, as it would on MySQL. The output
+includes the statements of each run: the bulk POST still sends one INSERT
+per item, on SQLite as on MySQL, because the ids are read back in request
+order. It saves the request and the commit per item, not the statements.
+
+On SQLite a statement costs microseconds, while every statement to Aiven
+is a network round trip. --latency-ms sleeps before each statement to
+show that case: the INSERTs of the bulk POST then cost as much as they do
+in the single POSTs.
+'''
+
+import os
+import tempfile
+import time
+
+import sqlalchemy
+
+import common
+
+
+def contacts(n: int) -> list:
+    return [{"email": f"m{i}@x", "telefonnummer": "1", "rolle": "r", "person_id": 1, "unternehmen_id": None,
+             "ref_typ": "Person"} for i in range(n)]
+
+
+def fresh_client(path: str, latency: float):
+    engine = common.file_engine(path)
+    common.seed(engine, 5)
+    if latency:
+        sqlalchemy.event.listen(engine, 'before_cursor_execute', lambda *args: time.sleep(latency))
+    return common.build_app(engine).test_client(), common.StatementCounter(engine)
+
+
+def main(argv=None):
+    parser = common.argument_parser("Compare single POSTs with one bulk POST of contacts.")
+    parser.add_argument('--items', type=int, default=2000)
+    parser.add_argument('--latency-ms', type=float, default=0, help="sleep before every statement")
+    args = common.parse_args(parser, argv)
+    items = contacts(args.items)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        client, counter = fresh_client(os.path.join(workdir, 'single.db'), args.latency_ms / 1000)
+        start = time.perf_counter()
+        for item in items:
+            response = client.post('/api/kontakt', json=item)
+            assert response.status_code == 201, response.get_data(as_text=True)
+        single = time.perf_counter() - start
+        single_statements = counter.n
+
+        client, counter = fresh_client(os.path.join(workdir, 'bulk.db'), args.latency_ms / 1000)
+        start = time.perf_counter()
+        response = client.post('/api/kontakt/bulk', json=items)
+        bulk = time.perf_counter() - start
+        assert response.status_code == 201, response.get_data(as_text=True)
+
+    print(f"{args.items} contacts: single POSTs {single:.2f} s ({single_statements} statements), "
+          f"bulk POST {bulk:.2f} s ({counter.n} statements)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+'''
+Shared setup of the benchmark and parity scripts in scripts/perf.
+
+Every script imports the backend package of the tree given with --root
+(default: this checkout), so the same script measures an older revision:
+
+    git worktree add /tmp/before <commit>~1
+    python scripts/perf/kontakt_statements.py --root /tmp/before
+    python scripts/perf/kontakt_statements.py
+
+The scripts run on SQLite and never connect to the Aiven database. Trees
+from before create_app (backend/app.py building the app at import time)
+are assembled from their route modules instead.
+'''
+
+import argparse
+import datetime
+import decimal
+import os
+import random
+import sys
+import time
+
+import sqlalchemy
+import sqlalchemy.orm
+from sqlalchemy.pool import StaticPool
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Config of the measured apps: no timing headers or metrics in the way
+APP_CONFIG = {"TESTING": True, "REQUEST_TIMING": False, "METRICS": False}
+
+_root = REPO_ROOT
+_legacy_apps = {}
+
+
+def argument_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--root', default=REPO_ROOT,
+                        help="checkout whose backend package is measured (default: this one)")
+    return parser
+
+
+def parse_args(parser: argparse.ArgumentParser, argv=None) -> argparse.Namespace:
+    """Parse the arguments and put the backend package of --root on sys.path."""
+    global _root
+    args = parser.parse_args(argv)
+    _root = os.path.abspath(args.root)
+    sys.path.insert(0, _root)
+    return args
+
+
+def memory_engine() -> sqlalchemy.Engine:
+    """In-memory SQLite database shared by all threads."""
+    return sqlalchemy.create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+
+
+def file_engine(path: str, **kwargs) -> sqlalchemy.Engine:
+    """SQLite database in a new file (an existing file is replaced)."""
+    if os.path.exists(path):
+        os.remove(path)
+    return sqlalchemy.create_engine(f"sqlite:///{path}", **kwargs)
+
+
+def seed(engine, n: int = 50, seed_: int = 1):
+    """
+    Create the tables and n rows of every main table.
+
+    This is the data set of the parity snapshot: persons and companies are
+    contacts in turn, every appointment has protocols, participants and
+    orders, and there are 2 * n order items.
+    """
+    import backend.classes.tables as t
+
+    rnd = random.Random(seed_)
+    t.Base.metadata.create_all(engine)
+    with sqlalchemy.orm.Session(engine) as session:
+        session.add_all([t.Terminart(Name=f"Art{i}") for i in range(1, 4)])
+        session.add_all([t.Wichtigkeit(level=f"L{i}") for i in range(1, 4)])
+        session.add_all([t.Produkt(Bezeichnung=f"P{i}", Preis=decimal.Decimal(f"{i}.50") if i != 2 else 0)
+                         for i in range(1, 6)])
+        session.add_all([t.Medium(Dateityp="pdf", Dateiname=f"f{i}.pdf") for i in range(1, 4)])
+        session.flush()
+        for i in range(1, n + 1):
+            session.add(t.Adresse(Plz=10000 + i, ortsname=f"Ort{i}", Strasse=f"Str{i}", Hausnr=i))
+        session.flush()
+        for i in range(1, n + 1):
+            session.add(t.Person(Adresse=i, Name=f"Pers{i}", Geburtsdatum=datetime.date(1980, 1, 1 + i % 28),
+                                 Titel="Dr"))
+            session.add(t.Unternehmen(Name=f"Firma{i}", Adresse=i, Umsatz=i * 1000))
+        session.flush()
+        for i in range(1, n + 1):
+            if i % 2:
+                session.add(t.Kontakt(EMail=f"k{i}@x.de", Telefonnummer=str(i), Rolle="r", PersonId=i,
+                                      UnternehmenId=None, RefTyp="Person"))
+            else:
+                session.add(t.Kontakt(EMail=f"k{i}@x.de", Telefonnummer=str(i), Rolle="r", PersonId=None,
+                                      UnternehmenId=i, RefTyp="Unternehmen" if i % 3 else "Other"))
+        session.flush()
+        base = datetime.datetime(2026, 1, 1, 9, 0)
+        for i in range(1, n + 1):
+            start = base + datetime.timedelta(hours=rnd.randint(0, 2000))
+            session.add(t.Termine(Titel=f"T{i}", Ort=f"Ort{i % 5}", Art=1 + i % 3, Start=start,
+                                  Ende=start + datetime.timedelta(hours=1), Uid=f"u{i % 4}"))
+        session.flush()
+        for i in range(1, n + 1):
+            session.add(t.Protokoll(Datum=base, Text="lorem ipsum " * 20 + f"ü{i}", Dauer=i, TLDR=f"tl{i}",
+                                    Termin=1 + i % n))
+            session.add(t.Teilnehmer(Kontakt=1 + i % n, Termin=1 + (i * 7) % n, istHaupt=bool(i % 2)))
+        session.flush()
+        for i in range(1, n + 1):
+            session.add(t.Anhang(Protokoll=i, Medium=1 + i % 3))
+            session.add(t.Auftrag(Bezeichnung=f"A{i}", wichtigkeit=[None, 1, 2, 3][i % 4], Kontakt=i,
+                                  terminid=(1 + (i * 3) % n) if i % 5 else None))
+        session.flush()
+        for i in range(1, 2 * n + 1):
+            session.add(t.Auftragsposition(Auftrag=1 + i % n, Produkt=1 + i % 5))
+        session.commit()
+
+
+def has_factory() -> bool:
+    """Whether the measured tree has backend.app.create_app."""
+    with open(os.path.join(_root, 'backend', 'app.py'), encoding='utf-8') as f:
+        return 'def create_app' in f.read()
+
+
+def build_app(engine, config: dict = None):
+    """Flask app of the measured tree on the given engine."""
+    if has_factory():
+        from backend.app import create_app
+        return create_app({**APP_CONFIG, "DATABASE_ENGINE": engine, **(config or {})})
+    return _legacy_app(engine)
+
+
+def _legacy_app(engine):
+    # Old route modules register on module level blueprints, so the app is
+    # built once per process and later engines are swapped into its database.
+    import backend.classes.aiven as aiven
+
+    app = _legacy_apps.get('app')
+    if app is None:
+        from flask import Flask
+        import backend.routes as routes
+
+        db = aiven.AivenDatabase.__new__(aiven.AivenDatabase)
+        aiven.AivenDatabase.__init__(db, None)
+        app = Flask('backend.app')
+        _legacy_apps.update(app=app, db=db)
+        _attach(db, engine)
+        try:
+            from backend.classes.cache import reference_cache
+            reference_cache.bind(db)
+        except ImportError:
+            pass
+        try:
+            from backend.classes.conditional import init_conditional_requests
+            init_conditional_requests(app)
+        except ImportError:
+            pass
+        if hasattr(db, 'remove_session'):
+            app.teardown_appcontext(db.remove_session)
+        for name in routes.__all__:
+            app.register_blueprint(getattr(routes, name)(db))
+    else:
+        _attach(_legacy_apps['db'], engine)
+    return app
+
+
+def _attach(db, engine):
+    db.engine = engine
+    if hasattr(db, 'remove_session'):
+        db.session_factory = sqlalchemy.orm.sessionmaker(bind=engine)
+        db.scoped_session = sqlalchemy.orm.scoped_session(db.session_factory)
+    else:
+        db.session = sqlalchemy.orm.Session(engine)
+
+
+class StatementCounter:
+    """Counts the statements an engine executes; reset with counter.n = 0."""
+
+    def __init__(self, engine):
+        self.n = 0
+        sqlalchemy.event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self.n += 1
+
+
+def best_of(fn, repeat: int = 5, clock=time.perf_counter) -> float:
+    """Shortest of repeat runs of fn() in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = clock()
+        fn()
+        best = min(best, clock() - start)
+    return best
@@ -0,0 +1,49 @@
+'''
+Size and CPU time of each compression encoding and level.
+
+Usage:
+    python scripts/perf/compression_levels.py [--root TREE] [--rows 3000]
+
+Takes two uncompressed 1000-row pages (participants, and protocols with
+their text), prints the CPU time of generating each page and compresses
+it with gzip, br and zstd at several levels. Encodings whose package
+(extra "compress") is not installed are skipped.
+'''
+
+import importlib.util
+import time
+
+import common
+
+URLS = ['/api/teilnehmer?limit=1000', '/api/protokoll?limit=1000&fields=tldr,datum,text,dauer,termin_id']
+LEVELS = {'gzip': (1, 6, 9), 'br': (1, 4, 6, 11), 'zstd': (1, 3, 9, 19)}
+
+
+def main(argv=None):
+    parser = common.argument_parser("Compare the size and CPU time of the compression levels.")
+    parser.add_argument('--rows', type=int, default=3000)
+    args = common.parse_args(parser, argv)
+    from backend.classes.compression import ENCODERS
+
+    engine = common.memory_engine()
+    common.seed(engine, args.rows)
+    client = common.build_app(engine, {"COMPRESSION": False}).test_client()
+    for url in URLS:
+        data = client.get(url).get_data()
+        cpu = common.best_of(lambda: client.get(url), 5, time.process_time)
+        print(f"{url}: {len(data) / 1024:.0f} KiB, request CPU {cpu * 1000:.1f} ms")
+        for name, levels in LEVELS.items():
+            encoder_class, module = ENCODERS[name]
+            if module is not None and importlib.util.find_spec(module) is None:
+                print(f"  {name:4} skipped, {module} is not installed")
+                continue
+            for level in levels:
+                encoder = encoder_class(level)
+                out = encoder.compress(data)
+                best = common.best_of(lambda: encoder.compress(data), 5 if level < 10 else 2, time.process_time)
+                print(f"  {name:4} {level:2}  {len(out) / 1024:7.1f} KiB  ratio {len(data) / len(out):5.1f}  "
+                      f"{best * 1000:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+'''
+Keep-alive HTTP load against a running server.
+
+Usage:
+    python scripts/perf/concurrency_load.py [--port 5090] [--clients 200] [--seconds 10]
+
+Each client keeps one HTTP/1.1 connection open and sends GET requests back
+to back, picked at random from single appointments, order summaries and
+20-row pages. The first 2 seconds are a warm-up and not measured. Prints
+the throughput, the latency percentiles and the errors (non-200 answers
+and dropped connections). Start the server with concurrency_server.py.
+'''
+
+import argparse
+import asyncio
+import random
+import time
+
+PATHS = ([f'/api/termine/{i}' for i in range(1, 51)] + [f'/api/auftrag/{i}/summary' for i in range(1, 51)]
+         + ['/api/kontakt?limit=20', '/api/teilnehmer?limit=20', '/api/termine?limit=20'] * 10)
+WARMUP = 2
+
+
+class Load:
+    def __init__(self, port: int):
+        self.port = port
+        self.latencies = []
+        self.errors = 0
+        self.total = 0
+
+    async def client(self, measure_from: float, stop: float):
+        rnd = random.Random()
+        while time.monotonic() < stop:
+            try:
+                reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+                while time.monotonic() < stop:
+                    start = time.monotonic()
+                    writer.write(f'GET {rnd.choice(PATHS)} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode())
+                    head = await reader.readuntil(b'\r\n\r\n')
+                    length = 0
+                    for line in head.split(b'\r\n'):
+                        if line.lower().startswith(b'content-length:'):
+                            length = int(line.split(b':')[1])
+                    await reader.readexactly(length)
+                    self.total += 1
+                    if int(head.split(b' ', 2)[1]) != 200:
+                        self.errors += 1
+                    if start >= measure_from:
+                        self.latencies.append(time.monotonic() - start)
+                writer.close()
+            except (ConnectionError, asyncio.IncompleteReadError):
+                self.errors += 1
+                await asyncio.sleep(0.05)
+
+    async def run(self, clients: int, seconds: float):
+        measure_from = time.monotonic() + WARMUP
+        await asyncio.gather(*(self.client(measure_from, measure_from + seconds) for _ in range(clients)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Send keep-alive GET requests from many concurrent clients.")
+    parser.add_argument('--port', type=int, default=5090)
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--seconds', type=float, default=10, help="measured duration after the warm-up")
+    args = parser.parse_args(argv)
+
+    load = Load(args.port)
+    asyncio.run(load.run(args.clients, args.seconds))
+    latencies = sorted(load.latencies)
+    if not latencies:
+        raise SystemExit(f"no responses, {load.errors} errors")
+    n = len(latencies)
+    print(f"{n / args.seconds:7.0f} req/s  p50 {latencies[n // 2] * 1000:6.0f} ms  "
+          f"p99 {latencies[int(n * .99)] * 1000:6.0f} ms  errors {load.errors}  total {load.total}")
+
+
+if __name__ == '__main__':
+    main()
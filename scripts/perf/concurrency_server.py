@@ -0,0 +1,98 @@
+'''
+Serve the API on a SQLite stand-in with simulated database latency.
+
+Usage:
+    python scripts/perf/concurrency_server.py {waitress,gunicorn,uvicorn} [--port 5090]
+        [--latency-ms 30] [--threads 4] [--workers 1] [--pool 15] [--root TREE]
+
+Seeds a SQLite file (common.seed, 50 rows per table) and sleeps
+--latency-ms before every statement, standing in for the round trip to
+Aiven. The threaded servers sleep in their worker thread; uvicorn serves
+backend.asgi on sqlite+aiosqlite and sleeps on the event loop, so only the
+waiting request is suspended. The pool has --pool connections and no
+overflow. Drive it with concurrency_load.py, e.g. for 200 clients:
+
+    python scripts/perf/concurrency_server.py uvicorn --pool 50 &
+    python scripts/perf/concurrency_load.py --clients 200
+
+Needs the extras "serve" (waitress, gunicorn) or "async" (uvicorn).
+'''
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import sqlalchemy
+
+import common
+
+
+def sync_app(path: str, latency: float, pool: int):
+    engine = sqlalchemy.create_engine(f"sqlite:///{path}", pool_size=pool, max_overflow=0,
+                                      connect_args={"check_same_thread": False})
+    if latency:
+        sqlalchemy.event.listen(engine, 'before_cursor_execute', lambda *args: time.sleep(latency))
+    return common.build_app(engine, {"TESTING": False})
+
+
+def async_app(path: str, latency: float, pool: int):
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.util import await_only
+    from backend.asgi import create_asgi_app
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", pool_size=pool, max_overflow=0)
+    if latency:
+        sqlalchemy.event.listen(engine.sync_engine, 'before_cursor_execute',
+                                lambda *args: await_only(asyncio.sleep(latency)))
+    return create_asgi_app({**common.APP_CONFIG, "TESTING": False, "DATABASE_ENGINE": engine})
+
+
+def serve(server: str, path: str, latency: float, args):
+    if server == 'uvicorn':
+        import uvicorn
+        uvicorn.run(async_app(path, latency, args.pool), host='127.0.0.1', port=args.port, log_level='warning',
+                    backlog=2048)
+    elif server == 'waitress':
+        import waitress
+        # A saturated server logs every queued request otherwise
+        logging.getLogger('waitress.queue').setLevel(logging.ERROR)
+        waitress.serve(sync_app(path, latency, args.pool), host='127.0.0.1', port=args.port, threads=args.threads,
+                       backlog=2048, connection_limit=1000, _quiet=True)
+    else:
+        from gunicorn.app.base import BaseApplication
+
+        class Application(BaseApplication):
+            def load_config(self):
+                for key, value in {'bind': f'127.0.0.1:{args.port}', 'workers': args.workers,
+                                   'threads': args.threads, 'worker_class': 'gthread', 'backlog': 2048,
+                                   'worker_connections': 1000, 'loglevel': 'warning'}.items():
+                    self.cfg.set(key, value)
+
+            def load(self):
+                return sync_app(path, latency, args.pool)
+
+        Application().run()
+
+
+def main(argv=None):
+    parser = common.argument_parser("Serve the API with simulated database latency.")
+    parser.add_argument('server', choices=['waitress', 'gunicorn', 'uvicorn'])
+    parser.add_argument('--port', type=int, default=5090)
+    parser.add_argument('--latency-ms', type=float, default=30, help="sleep before every statement")
+    parser.add_argument('--threads', type=int, default=4, help="threads per worker (waitress, gunicorn)")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes (gunicorn)")
+    parser.add_argument('--pool', type=int, default=15, help="connections per process")
+    args = common.parse_args(parser, argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'concurrency.db')
+        common.seed(common.file_engine(path), 50)
+        print(f"serving {args.server} on 127.0.0.1:{args.port}", file=sys.stderr)
+        serve(args.server, path, args.latency_ms / 1000, args)
+
+
+if __name__ == '__main__':
+    main()
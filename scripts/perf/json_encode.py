@@ -0,0 +1,68 @@
+'''
+JSON encoding cost per provider.
+
+Usage:
+    python scripts/perf/json_encode.py [--root TREE] [--contacts 50000] [--page-rows 2000]
+
+Encodes the body of GET /api/kontakt?all=true with app.json.response()
+and times the whole request, for each JSON_PROVIDER (json, and orjson if
+it is installed). Then it prints the CPU time of 1000-row pages of a
+smaller database. Trees without JSON_PROVIDER (before e42bfd2) run once
+with Flask's default provider:
+
+    git worktree add /tmp/before e42bfd2~1
+    python scripts/perf/json_encode.py --root /tmp/before
+
+The parity of the two providers is checked with the snapshot:
+
+    python scripts/perf/snapshot.py capture /tmp/json.json --config '{"JSON_PROVIDER": "json"}'
+'''
+
+import importlib.util
+import os
+import time
+
+import common
+
+PAGES = ['/api/termine?limit=1000', '/api/kontakt?limit=1000', '/api/protokoll?limit=1000']
+
+
+def providers(root: str) -> list:
+    if not os.path.exists(os.path.join(root, 'backend', 'classes', 'json_provider.py')):
+        return [None]
+    return ['json'] + (['orjson'] if importlib.util.find_spec('orjson') else [])
+
+
+def main(argv=None):
+    parser = common.argument_parser("Compare the JSON providers on large and page sized responses.")
+    parser.add_argument('--contacts', type=int, default=50000)
+    parser.add_argument('--page-rows', type=int, default=2000, help="rows per table of the page database")
+    args = common.parse_args(parser, argv)
+    names = providers(os.path.abspath(args.root))
+
+    engine = common.memory_engine()
+    common.seed(engine, args.contacts)
+    for name in names:
+        app = common.build_app(engine, {"JSON_PROVIDER": name} if name else {})
+        client = app.test_client()
+        body = client.get('/api/kontakt?all=true').get_json()
+        with app.app_context():
+            encode = common.best_of(lambda: app.json.response(body), 7)
+            size = len(app.json.response(body).get_data())
+        request = common.best_of(lambda: client.get('/api/kontakt?all=true'), 3)
+        print(f"{name or 'default'}: {len(body['contacts'])} contacts, {size / 1e6:.1f} MB, "
+              f"encode {encode * 1000:.0f} ms ({size / encode / 1e6:.0f} MB/s), GET {request * 1000:.0f} ms")
+
+    engine = common.memory_engine()
+    common.seed(engine, args.page_rows)
+    for name in names:
+        client = common.build_app(engine, {"JSON_PROVIDER": name} if name else {}).test_client()
+        cpu = []
+        for url in PAGES:
+            client.get(url)
+            cpu.append(f"{url} {common.best_of(lambda: client.get(url), 15, time.process_time) * 1000:.1f} ms")
+        print(f"{name or 'default'} CPU per page: " + ', '.join(cpu))
+
+
+if __name__ == '__main__':
+    main()
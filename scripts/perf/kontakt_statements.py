@@ -0,0 +1,40 @@
+'''
+SQL statements of GET /api/kontakt by number of contacts.
+
+Usage:
+    python scripts/perf/kontakt_statements.py [--root TREE] [--contacts 50 500 5000]
+
+Each size gets a freshly seeded in-memory database (common.seed). Before
+the batched reference resolution the statement count grew with the
+number of contacts; compare a checkout of its parent:
+
+    git worktree add /tmp/before 5a3d582~1
+    python scripts/perf/kontakt_statements.py --root /tmp/before
+
+On later trees the list is paginated, so the count covers the first page.
+'''
+
+import time
+
+import common
+
+
+def main(argv=None):
+    parser = common.argument_parser("Count the SQL statements of GET /api/kontakt.")
+    parser.add_argument('--contacts', type=int, nargs='+', default=[50, 500, 5000])
+    args = common.parse_args(parser, argv)
+
+    print("contacts  status  statements      time")
+    for n in args.contacts:
+        engine = common.memory_engine()
+        common.seed(engine, n)
+        client = common.build_app(engine).test_client()
+        counter = common.StatementCounter(engine)
+        start = time.perf_counter()
+        response = client.get('/api/kontakt')
+        elapsed = time.perf_counter() - start
+        print(f"{n:8}  {response.status_code:6}  {counter.n:10}  {elapsed * 1000:6.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
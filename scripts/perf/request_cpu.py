@@ -0,0 +1,80 @@
+'''
+CPU time per request of the WSGI app and the ASGI adapter, in process.
+
+Usage:
+    python scripts/perf/request_cpu.py [--root TREE] [--requests 2000]
+
+Sends the request mix of concurrency_load.py straight to the application
+objects, without an HTTP server, and prints CPU and wall time per
+request for:
+- the WSGI app on a sync SQLite engine,
+- the ASGI adapter on the same sync engine (the cost of the greenlets),
+- the ASGI adapter on sqlite+aiosqlite (needs the extra "async").
+'''
+
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+import sqlalchemy
+
+import common
+from concurrency_load import PATHS
+
+WARMUP = 100
+
+
+def scope(path: str) -> dict:
+    path, _, query = path.partition('?')
+    return {'type': 'http', 'method': 'GET', 'path': path, 'query_string': query.encode(),
+            'headers': [(b'host', b'localhost')], 'http_version': '1.1', 'scheme': 'http', 'root_path': ''}
+
+
+def measure(call, paths: list) -> tuple:
+    """CPU and wall milliseconds per request."""
+    for path in paths[:WARMUP]:
+        call(path)
+    cpu, wall = time.process_time(), time.perf_counter()
+    for path in paths:
+        call(path)
+    return (time.process_time() - cpu) / len(paths) * 1000, (time.perf_counter() - wall) / len(paths) * 1000
+
+
+def main(argv=None):
+    parser = common.argument_parser("Measure the CPU time per request of the WSGI and ASGI apps.")
+    parser.add_argument('--requests', type=int, default=2000)
+    args = common.parse_args(parser, argv)
+    from backend.asgi import AsgiApplication, build_environ, create_asgi_app
+
+    rnd = random.Random(1)
+    paths = [rnd.choice(PATHS) for _ in range(args.requests)]
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'request_cpu.db')
+        common.seed(common.file_engine(path), 50)
+
+        wsgi = common.build_app(sqlalchemy.create_engine(f"sqlite:///{path}"))
+        print("WSGI, sync engine:          %.2f ms CPU, %.2f ms wall" % measure(
+            lambda p: b''.join(wsgi(build_environ(scope(p), b''), lambda *args: None)), paths))
+
+        loop = asyncio.new_event_loop()
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            pass
+
+        adapter = AsgiApplication(wsgi, wsgi.extensions['aiven_db'])
+        print("ASGI adapter, sync engine:  %.2f ms CPU, %.2f ms wall" % measure(
+            lambda p: loop.run_until_complete(adapter(scope(p), receive, send)), paths))
+
+        from sqlalchemy.ext.asyncio import create_async_engine
+        asgi = create_asgi_app({**common.APP_CONFIG, "DATABASE_ENGINE": create_async_engine(f"sqlite+aiosqlite:///{path}")})
+        print("ASGI adapter, aiosqlite:    %.2f ms CPU, %.2f ms wall" % measure(
+            lambda p: loop.run_until_complete(asgi(scope(p), receive, send)), paths))
+
+
+if __name__ == '__main__':
+    main()
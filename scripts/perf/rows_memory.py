@@ -0,0 +1,50 @@
+'''
+CPU time and memory peak of the collection endpoints.
+
+Usage:
+    python scripts/perf/rows_memory.py [--root TREE] [--rows 20000]
+
+Seeds --rows rows per table (common.seed) and prints, per URL, the rows
+returned, the best CPU time of 5 requests and the tracemalloc peak of one
+request. To compare the ORM object path with column rows:
+
+    git worktree add /tmp/before 2836c29~1
+    python scripts/perf/rows_memory.py --root /tmp/before
+'''
+
+import time
+import tracemalloc
+
+import common
+
+URLS = [
+    '/api/kontakt?all=true',
+    '/api/teilnehmer?all=true',
+    '/api/termine?all=true',
+    '/api/adresse?all=true',
+    '/api/kontakt?limit=1000',
+    '/api/teilnehmer?limit=1000&expand=',
+]
+
+
+def main(argv=None):
+    parser = common.argument_parser("Measure CPU time and memory peak of the collection endpoints.")
+    parser.add_argument('--rows', type=int, default=20000)
+    args = common.parse_args(parser, argv)
+
+    engine = common.memory_engine()
+    common.seed(engine, args.rows)
+    client = common.build_app(engine).test_client()
+    for url in URLS:
+        body = client.get(url).get_json()
+        rows = sum(len(value) for value in body.values() if isinstance(value, list))
+        cpu = common.best_of(lambda: client.get(url), 5, time.process_time)
+        tracemalloc.start()
+        client.get(url)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{url:40} {rows:6} rows {cpu * 1000:8.1f} ms  peak {peak / 1e6:7.1f} MB", flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+'''
+Parity snapshot of the whole API.
+
+Usage:
+    python scripts/perf/snapshot.py capture OUT.json [--root TREE] [--config JSON] [--asgi]
+    python scripts/perf/snapshot.py compare A.json B.json [--show N]
+
+capture seeds a fresh SQLite database (common.seed, 50 rows per table) and
+sends a fixed sequence of requests: list variants, pagination, field
+selection, streams, single items, conditional GETs and every write path
+(create, update, delete and bulk) of each resource, plus the filters and
+sub-resources. For each request it stores the status, Content-Type, ETag,
+Cache-Control, Content-Range, body and the number of SQL statements.
+
+compare lists the requests whose stored response differs and prints the
+statement totals. Two trees are compared by capturing both:
+
+    python scripts/perf/snapshot.py capture /tmp/before.json --root /tmp/before
+    python scripts/perf/snapshot.py capture /tmp/after.json
+    python scripts/perf/snapshot.py compare /tmp/before.json /tmp/after.json
+
+--config adds app config values, e.g. '{"JSON_PROVIDER": "json"}'. --asgi
+sends the requests through backend.asgi on sqlite+aiosqlite (extra "async").
+'''
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+import common
+
+ENDPOINTS = ['products', 'adresse', 'person', 'unternehmen', 'kontakt', 'terminart', 'termine',
+             'protokoll', 'teilnehmer', 'medium', 'anhang', 'wichtigkeit', 'auftrag', 'auftragsposition']
+
+# (create, update) payload per resource
+PAYLOADS = {
+    'products': ({'name': 'Neu', 'price': 12.5}, {'price': 0}),
+    'adresse': ({'plz': 12345, 'ortsname': 'O', 'strasse': 'S', 'hausnr': 3}, {'hausnr': 4}),
+    'person': ({'name': 'N', 'adresse_id': 1, 'geburtsdatum': '1990-02-03', 'titel': 'Prof'},
+               {'geburtsdatum': '1991-03-04T10:00:00'}),
+    'unternehmen': ({'name': 'F', 'adresse_id': 2, 'umsatz': 7}, {'umsatz': 8}),
+    'kontakt': ({'email': 'a@b', 'telefonnummer': '1', 'rolle': 'x', 'person_id': 1, 'unternehmen_id': None,
+                 'ref_typ': 'Person'}, {'ref_typ': 'Unternehmen', 'unternehmen_id': 2}),
+    'terminart': ({'name': 'Neu'}, {'name': 'Neu2'}),
+    'termine': ({'title': 'T', 'ort': 'Ort1', 'art_id': 2, 'start': '2026-05-01T10:00:00',
+                 'ende': '2026-05-01T11:00:00', 'uid': 'u9'}, {'ende': '2026-05-01T12:00:00'}),
+    'protokoll': ({'datum': '2026-05-01T10:00:00', 'text': 'hallo', 'dauer': 3, 'tldr': 't', 'termin_id': 1},
+                  {'text': 'neu'}),
+    'teilnehmer': ({'kontakt_id': 1, 'termin_id': 2, 'istHaupt': True}, {'istHaupt': False}),
+    'medium': ({'dateityp': 'png', 'dateiname': 'a.png'}, {'dateiname': 'b.png'}),
+    'anhang': ({'protokoll_id': 1, 'medium_id': 2}, {'medium_id': 3}),
+    'wichtigkeit': ({'level': 'L9'}, {'level': 'L8'}),
+    'auftrag': ({'bezeichnung': 'B', 'wichtigkeit_id': 1, 'kontakt_id': 2, 'termin_id': 3},
+                {'wichtigkeit_id': None}),
+    'auftragsposition': ({'auftrag_id': 1, 'produkt_id': 2}, {'produkt_id': 3}),
+}
+
+# Nested objects per resource, requested with ?expand= and ?fields=
+RELATIONS = {'person': ['adresse'], 'unternehmen': ['adresse'], 'kontakt': ['referenz_data'], 'termine': ['art'],
+             'protokoll': ['termin'], 'teilnehmer': ['kontakt', 'termin'], 'anhang': ['protokoll', 'medium'],
+             'auftrag': ['wichtigkeit', 'kontakt'], 'auftragsposition': ['auftrag', 'produkt']}
+
+EXTRA_GETS = [
+    '/api/termine?from=2026-01-10T00:00:00&to=2026-02-01T00:00:00', '/api/termine?art_id=1', '/api/termine?art_id=x',
+    '/api/termine?ort=Ort1&fields=title', '/api/termine?uid=u1&stream=ndjson', '/api/termine?limit=5',
+    '/api/termine/window?start=2026-01-01T00:00:00&end=2026-01-20T00:00:00', '/api/termine/window?start=x&end=y',
+    '/api/termine/window?start=2026-01-01T00:00:00',
+    '/api/termine/1/teilnehmer', '/api/termine/3/protokolle?fields=text', '/api/termine/4/auftraege',
+    '/api/termine/999/teilnehmer',
+    '/api/auftrag/1/positionen', '/api/auftrag/1/positionen?stream=ndjson', '/api/auftrag/999/positionen',
+    '/api/auftrag/summary', '/api/auftrag/summary?limit=3', '/api/auftrag/2/summary', '/api/auftrag/999/summary',
+    '/api/protokoll/1/anhaenge', '/api/protokoll/999/anhaenge', '/api/protokoll/1/text', '/api/protokoll/999/text',
+    '/api/protokoll?fields=text,tldr', '/', '/health',
+]
+
+
+class AsgiClient:
+    """Minimal test client that sends requests through an ASGI application."""
+
+    def __init__(self, app):
+        self.app = app
+        self.loop = asyncio.new_event_loop()
+
+    def open(self, path, method='GET', **kwargs):
+        from werkzeug.test import EnvironBuilder
+        from werkzeug.wrappers import Response
+
+        environ = EnvironBuilder(path=path, method=method, **kwargs).get_environ()
+        body = environ['wsgi.input'].read()
+        headers = [(key[5:].replace('_', '-').lower().encode(), value.encode())
+                   for key, value in environ.items() if key.startswith('HTTP_')]
+        if environ.get('CONTENT_TYPE'):
+            headers.append((b'content-type', environ['CONTENT_TYPE'].encode()))
+        scope = {'type': 'http', 'method': method, 'path': environ['PATH_INFO'],
+                 'query_string': environ['QUERY_STRING'].encode(), 'headers': headers, 'http_version': '1.1',
+                 'server': ('localhost', 80), 'client': ('127.0.0.1', 1)}
+        result = {'body': []}
+
+        async def run():
+            received = False
+
+            async def receive():
+                nonlocal received
+                if received:
+                    await asyncio.sleep(3600)  # no disconnect while the response is sent
+                received = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    result['status'] = message['status']
+                    result['headers'] = [(k.decode(), v.decode()) for k, v in message['headers']]
+                else:
+                    result['body'].append(message.get('body', b''))
+
+            await self.app(scope, receive, send)
+
+        self.loop.run_until_complete(run())
+        response = Response(b''.join(result['body']), status=result['status'], headers=result['headers'])
+        if not any(key.lower() == 'content-type' for key, _ in result['headers']):
+            del response.headers['Content-Type']  # no default type the application did not send
+        return response
+
+    def get(self, path, **kwargs):
+        return self.open(path, 'GET', **kwargs)
+
+
+def make_client(config: dict, asgi: bool, workdir: str):
+    """Test client and statement counter on a freshly seeded database."""
+    if not asgi:
+        engine = common.memory_engine()
+        common.seed(engine, 50)
+        return common.build_app(engine, config).test_client(), common.StatementCounter(engine)
+
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from backend.asgi import create_asgi_app
+
+    path = os.path.join(workdir, 'snapshot.db')
+    common.seed(common.file_engine(path), 50)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    app = create_asgi_app({**common.APP_CONFIG, "DATABASE_ENGINE": engine, **config})
+    return AsgiClient(app), common.StatementCounter(engine.sync_engine)
+
+
+def _json(response) -> dict:
+    # Older trees lack some routes (pagination, bulk) and answer with HTML
+    body = response.get_json(silent=True)
+    return body if isinstance(body, dict) else {}
+
+
+def capture(client, counter) -> dict:
+    responses, statements = {}, {}
+
+    def record(key, response):
+        responses[key] = [response.status_code, response.headers.get('Content-Type'), response.headers.get('ETag'),
+                          response.headers.get('Cache-Control'), response.headers.get('Content-Range'),
+                          response.get_data(as_text=True)]
+        statements[key] = counter.n
+        return response
+
+    def call(method, path, **kwargs):
+        counter.n = 0
+        payload = json.dumps(kwargs.get('json', kwargs.get('data')))
+        return record(f'{len(responses):04d} {method} {path} {payload}', client.open(path, method=method, **kwargs))
+
+    for path in EXTRA_GETS:
+        call('GET', path)
+    counter.n = 0
+    record('GET text range', client.get('/api/protokoll/1/text', headers={'Range': 'bytes=0-9'}))
+
+    for name in ENDPOINTS:
+        base = f'/api/{name}'
+        for query in ('', '?all=true', '?limit=7', '?limit=0', '?limit=x', '?after=zz', '?fields=nope',
+                      '?expand=nope', '?expand=', '?stream=ndjson', '?stream=ndjson&fields=id'):
+            call('GET', base + query)
+        cursor = _json(client.get(base + '?limit=7')).get('next_cursor')
+        call('GET', f'{base}?limit=7&after={cursor}')
+        for relation in RELATIONS.get(name, []):
+            call('GET', f'{base}?expand={relation}&limit=5')
+            call('GET', f'{base}?fields=id,{relation}&limit=5')
+        create, update = PAYLOADS[name]
+        fields = list(create)
+        call('GET', f'{base}?fields={fields[0]}&limit=5')
+        call('GET', f'{base}?fields={",".join(fields[-2:])}&limit=5&stream=ndjson')
+        for item_id in (1, 2, 3, 9999):
+            call('GET', f'{base}/{item_id}')
+        etag = client.get(f'{base}/1').headers.get('ETag')
+        if etag:
+            counter.n = 0
+            record(f'{name} 304', client.get(f'{base}/1', headers={'If-None-Match': etag}))
+
+        new_id = _json(call('POST', base, json=create)).get('id')
+        call('POST', base, json={k: v for k, v in list(create.items())[1:]})
+        call('POST', base, data='notjson', content_type='text/plain')
+        call('POST', base, json=[1])
+        call('GET', f'{base}/{new_id}')
+        call('PUT', f'{base}/{new_id}', json=update)
+        call('PUT', f'{base}/{new_id}', json={})
+        call('PUT', f'{base}/9999', json=update)
+        call('PUT', f'{base}/{new_id}', data='notjson', content_type='text/plain')
+        call('GET', f'{base}/{new_id}')
+        call('DELETE', f'{base}/{new_id}')
+        call('DELETE', f'{base}/{new_id}')
+        ids = _json(call('POST', f'{base}/bulk', json=[create, create])).get('ids', [])
+        call('POST', f'{base}/bulk', json=[create, {}])
+        call('PUT', f'{base}/bulk', json=[dict(update, id=i) for i in ids])
+        call('PUT', f'{base}/bulk', json=[dict(update, id=99999)])
+        call('DELETE', f'{base}/bulk', json={'ids': ids})
+        call('GET', base + '?all=true')
+
+    return {'responses': responses, 'statements': statements}
+
+
+def compare(a: dict, b: dict, show: int = 10) -> int:
+    """Print the differing responses and return their number."""
+    diffs = [key for key in a['responses'] if a['responses'][key] != b['responses'].get(key)]
+    for key in diffs[:show]:
+        print('==', key)
+        print('  A', str(a['responses'][key])[:600])
+        print('  B', str(b['responses'].get(key))[:600])
+    print(f"{len(diffs)} of {len(a['responses'])} responses differ, "
+          f"statements {sum(a['statements'].values())} -> {sum(b['statements'].values())}")
+    return len(diffs)
+
+
+def main(argv=None):
+    parser = common.argument_parser("Capture or compare a parity snapshot of the API.")
+    parser.add_argument('command', choices=['capture', 'compare'])
+    parser.add_argument('files', nargs='+', help="capture: output file; compare: two snapshot files")
+    parser.add_argument('--config', default='{}', help="app config values as a JSON object")
+    parser.add_argument('--asgi', action='store_true', help="send the requests through backend.asgi")
+    parser.add_argument('--show', type=int, default=10, help="differences to print (compare)")
+    args = common.parse_args(parser, argv)
+
+    if args.command == 'compare':
+        if len(args.files) != 2:
+            parser.error("compare needs two snapshot files")
+        with open(args.files[0], encoding='utf-8') as a, open(args.files[1], encoding='utf-8') as b:
+            sys.exit(1 if compare(json.load(a), json.load(b), args.show) else 0)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        client, counter = make_client(json.loads(args.config), args.asgi, workdir)
+        snapshot = capture(client, counter)
+    with open(args.files[0], 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, indent=0, ensure_ascii=False)
+    print(f"{len(snapshot['responses'])} requests, {sum(snapshot['statements'].values())} statements")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+'''
+Startup time: process launch to the first served request.
+
+Usage:
+    python scripts/perf/startup.py [--root TREE] [--against OTHER_TREE] [--runs 25]
+
+Each run starts a new interpreter that imports backend.app, takes its app
+and serves GET / with the test client. The Aiven variables point to an
+unreachable host: "/" does not need the database, so a tree that connects
+at import time shows up as slow or failing. With --against the runs of
+both trees are interleaved, which evens out background load:
+
+    git worktree add /tmp/before 476bb74~1
+    python scripts/perf/startup.py --against /tmp/before
+
+The import time of backend.app and whether PyMySQL was imported are
+reported from inside the process as well.
+'''
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import common
+
+UNREACHABLE = {
+    'AIVEN_SERVICE_URI': 'mysql+pymysql://u:p@10.255.255.1:3306/db', 'AIVEN_HOST': '10.255.255.1',
+    'AIVEN_PORT': '3306', 'AIVEN_USER': 'u', 'AIVEN_PASSWORD': 'p', 'AIVEN_DATABASE_NAME': 'db',
+    'AIVEN_CERT_PATH': os.devnull,
+}
+
+CHILD = '''
+import sys, time
+start = time.perf_counter()
+from backend.app import app
+imported = time.perf_counter() - start
+assert app.test_client().get('/').status_code == 200
+print(imported, 'pymysql' in sys.modules)
+'''
+
+
+def run(root: str) -> tuple:
+    """(wall time, import time, PyMySQL imported) of one process."""
+    env = dict(os.environ, **UNREACHABLE)
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, '-c', CHILD], cwd=root, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if out.returncode != 0:
+        raise RuntimeError(f"{root}: {out.stderr.strip().splitlines()[-1:]}")
+    imported, pymysql = out.stdout.split()[-2:]
+    return elapsed, float(imported), pymysql == 'True'
+
+
+def main(argv=None):
+    parser = common.argument_parser("Measure the time from process launch to the first served request.")
+    parser.add_argument('--against', help="second checkout whose runs are interleaved with --root")
+    parser.add_argument('--runs', type=int, default=25)
+    args = common.parse_args(parser, argv)
+
+    roots = [os.path.abspath(args.root)] + ([os.path.abspath(args.against)] if args.against else [])
+    results = {root: [] for root in roots}
+    for _ in range(args.runs):
+        for root in roots:
+            results[root].append(run(root))
+    for root, runs in results.items():
+        walls = [wall for wall, _, _ in runs]
+        imports = [imported for _, imported, _ in runs]
+        print(f"{root}: median {statistics.median(walls) * 1000:.0f} ms  min {min(walls) * 1000:.0f} ms  "
+              f"import backend.app {statistics.median(imports) * 1000:.0f} ms  pymysql imported: {runs[-1][2]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+'''
+One-week time range filter on GET /api/termine by table size.
+
+Usage:
+    python scripts/perf/termine_filter.py [--root TREE] [--appointments 1000 10000 100000]
+
+Each size gets a SQLite file with about one appointment per hour and as
+many orders as appointments. The one-week window (from/to) holds about
+160 appointments whatever the size, so its time should stay flat; the
+unfiltered ?all=true listing is printed for scale.
+
+Trees from before 02ed53b have no filters and ignore from/to, so their
+"window" is simply the first page.
+'''
+
+import datetime
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import sqlalchemy
+
+import common
+
+WINDOW = '/api/termine?from=2020-01-10T00:00:00&to=2020-01-17T00:00:00&limit=1000'
+
+
+def populate(engine, n: int):
+    import backend.classes.tables as t
+
+    rnd = random.Random(1)
+    base = datetime.datetime(2020, 1, 1)
+    t.Base.metadata.create_all(engine)
+    rows = []
+    for i in range(n):
+        start = base + datetime.timedelta(minutes=rnd.randint(0, n * 60))
+        rows.append({"Titel": f"T{i}", "Ort": f"Ort{i % 50}", "Art": 1 + i % 3, "Start": start,
+                     "Ende": start + datetime.timedelta(hours=1), "Uid": f"u{i}"})
+    with engine.begin() as connection:
+        connection.execute(sqlalchemy.insert(t.Terminart), [{"Name": f"A{i}"} for i in range(3)])
+        connection.execute(sqlalchemy.insert(t.Wichtigkeit), [{"level": f"L{i}"} for i in range(3)])
+        connection.execute(sqlalchemy.insert(t.Termine), rows)
+        connection.execute(sqlalchemy.insert(t.Auftrag), [
+            {"Bezeichnung": f"A{i}", "wichtigkeit": [None, 1, 2, 3][i % 4], "Kontakt": 1, "terminid": 1 + rnd.randrange(n)}
+            for i in range(n)])
+
+
+def median_time(client, url: str, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.get(url)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main(argv=None):
+    parser = common.argument_parser("Time the one-week filter of GET /api/termine by table size.")
+    parser.add_argument('--appointments', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = common.parse_args(parser, argv)
+
+    print("appointments   window rows   window ms   unfiltered ms")
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in args.appointments:
+            engine = common.file_engine(os.path.join(workdir, f'termine{n}.db'))
+            populate(engine, n)
+            client = common.build_app(engine).test_client()
+            response = client.get(WINDOW)
+            assert response.status_code == 200, response.get_data(as_text=True)
+            window = median_time(client, WINDOW, 10)
+            unfiltered = median_time(client, '/api/termine?all=true', 3)
+            print(f"{n:12}   {response.get_json()['count']:11}   {window * 1000:9.1f}   {unfiltered * 1000:13.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+'''
+GET /api/termine with many appointments and orders.
+
+Usage:
+    python scripts/perf/termine_orders.py [--root TREE] [--appointments 10000] [--orders 50000]
+
+The appointment importance comes from the orders of each appointment. The
+tree before it was resolved in SQL scanned all orders per appointment:
+
+    git worktree add /tmp/before 0d259a6~1
+    python scripts/perf/termine_orders.py --root /tmp/before
+
+That run takes minutes at the default sizes; start with smaller ones.
+
+The request is GET /api/termine?all=true, so trees with pagination list
+every appointment as well; older trees ignore the parameter.
+'''
+
+import datetime
+import os
+import random
+import tempfile
+import time
+
+import sqlalchemy
+
+import common
+
+
+def populate(engine, appointments: int, orders: int):
+    import backend.classes.tables as t
+
+    rnd = random.Random(3)
+    base = datetime.datetime(2026, 1, 1)
+    t.Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(sqlalchemy.insert(t.Terminart.__table__), [{"Name": f"A{i}"} for i in range(5)])
+        connection.execute(sqlalchemy.insert(t.Wichtigkeit.__table__), [{"level": f"L{i}"} for i in range(3)])
+        connection.execute(sqlalchemy.insert(t.Termine.__table__), [
+            dict(Titel=f"T{i}", Ort="o", Art=1 + i % 5, Start=base + datetime.timedelta(minutes=rnd.randint(0, 10 ** 6)),
+                 Ende=base, Uid="u")
+            for i in range(appointments)])
+        connection.execute(sqlalchemy.insert(t.Auftrag.__table__), [
+            dict(Bezeichnung="b", wichtigkeit=rnd.choice([None, 1, 2, 3]), Kontakt=1,
+                 terminid=rnd.choice([None, rnd.randint(1, appointments)]))
+            for _ in range(orders)])
+
+
+def main(argv=None):
+    parser = common.argument_parser("Time GET /api/termine with many appointments and orders.")
+    parser.add_argument('--appointments', type=int, default=10000)
+    parser.add_argument('--orders', type=int, default=50000)
+    args = common.parse_args(parser, argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = common.file_engine(os.path.join(workdir, 'termine.db'))
+        populate(engine, args.appointments, args.orders)
+        client = common.build_app(engine).test_client()
+        counter = common.StatementCounter(engine)
+        for _ in range(2):
+            counter.n = 0
+            start = time.perf_counter()
+            response = client.get('/api/termine?all=true')
+            elapsed = time.perf_counter() - start
+            print(f"{response.status_code} {response.get_json()['count']} appointments, "
+                  f"{counter.n} statements, {elapsed * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
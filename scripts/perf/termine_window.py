@@ -0,0 +1,83 @@
+'''
+Calendar window (GET /api/termine/window) over many appointments.
+
+Usage:
+    python scripts/perf/termine_window.py [--root TREE] [--appointments 10000 100000] [--years 10]
+
+The appointments are spread over --years years, last 30 minutes to three
+days and have three participants each, drawn from 2000 contacts. A week
+and a year are requested; the output lists the appointments,
+participants, response size, median time and statements per request.
+'''
+
+import datetime
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import sqlalchemy
+
+import common
+
+WINDOWS = [
+    ('week', '/api/termine/window?start=2022-03-01T00:00:00&end=2022-03-08T00:00:00'),
+    ('year', '/api/termine/window?start=2022-01-01T00:00:00&end=2023-01-01T00:00:00'),
+]
+
+
+def populate(engine, n: int, years: float):
+    import backend.classes.tables as t
+
+    rnd = random.Random(1)
+    base = datetime.datetime(2020, 1, 1)
+    span = int(years * 365 * 24 * 60)
+    t.Base.metadata.create_all(engine)
+    rows = []
+    for i in range(n):
+        start = base + datetime.timedelta(minutes=rnd.randint(0, span))
+        rows.append({"Titel": f"T{i}", "Ort": f"Ort{i % 50}", "Art": 1 + i % 3, "Start": start,
+                     "Ende": start + datetime.timedelta(minutes=rnd.choice([30, 60, 120, 60 * 24 * 3])),
+                     "Uid": f"u{i}"})
+    with engine.begin() as connection:
+        connection.execute(sqlalchemy.insert(t.Terminart), [{"Name": f"A{i}"} for i in range(3)])
+        connection.execute(sqlalchemy.insert(t.Kontakt), [
+            {"E-Mail": f"k{i}@x", "Telefonnummer": "1", "Rolle": "r", "PersonId": None, "UnternehmenId": None,
+             "RefTyp": "x"} for i in range(2000)])
+        connection.execute(sqlalchemy.insert(t.Termine), rows)
+        connection.execute(sqlalchemy.insert(t.Teilnehmer), [
+            {"Kontakt": 1 + rnd.randrange(2000), "Termin": 1 + i // 3, "istHaupt": i % 3 == 0}
+            for i in range(3 * n)])
+
+
+def main(argv=None):
+    parser = common.argument_parser("Time the calendar window endpoint over many appointments.")
+    parser.add_argument('--appointments', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--years', type=float, default=10)
+    args = common.parse_args(parser, argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in args.appointments:
+            engine = common.file_engine(os.path.join(workdir, f'window{n}.db'))
+            populate(engine, n, args.years)
+            client = common.build_app(engine).test_client()
+            counter = common.StatementCounter(engine)
+            for label, url in WINDOWS:
+                response = client.get(url)
+                assert response.status_code == 200, response.get_data(as_text=True)
+                times = []
+                for _ in range(5):
+                    counter.n = 0
+                    start = time.perf_counter()
+                    response = client.get(url)
+                    times.append(time.perf_counter() - start)
+                body = response.get_json()
+                participants = sum(len(appointment['teilnehmer']) for appointment in body['appointments'])
+                print(f"{n} appointments, {label}: {body['count']} appointments, {participants} participants, "
+                      f"{len(response.get_data()) // 1024} KiB, {statistics.median(times) * 1000:.1f} ms, "
+                      f"{counter.n} statements")
+
+
+if __name__ == '__main__':
+    main()
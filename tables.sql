@@ -4,7 +4,8 @@ CREATE TABLE IF NOT EXISTS `Person` (
 	`Name` VARCHAR(255) NOT NULL,
 	`Geburtsdatum` DATE NOT NULL,
 	`Titel` VARCHAR(255) NOT NULL,
-	PRIMARY KEY(`id`)
+	PRIMARY KEY(`id`),
+	INDEX `ix_Person_Adresse` (`Adresse`)
 );
 
 
@@ -13,7 +14,8 @@ CREATE TABLE IF NOT EXISTS `Unternehmen` (
 	`Name` VARCHAR(255) NOT NULL,
 	`Adresse` INTEGER NOT NULL,
 	`Umsatz` INTEGER NOT NULL,
-	PRIMARY KEY(`id`)
+	PRIMARY KEY(`id`),
+	INDEX `ix_Unternehmen_Adresse` (`Adresse`)
 );
 
 
@@ -24,17 +26,25 @@ CREATE TABLE IF NOT EXISTS `Protokoll` (
 	`Dauer` INTEGER NOT NULL,
 	`TLDR` VARCHAR(255) NOT NULL,
 	`Termin` INTEGER NOT NULL,
-	PRIMARY KEY(`id`)
+	PRIMARY KEY(`id`),
+	INDEX `ix_Protokoll_Termin` (`Termin`)
 );
 
 
 CREATE TABLE IF NOT EXISTS `Termine` (
 	`id` INTEGER NOT NULL AUTO_INCREMENT UNIQUE,
+	`Titel` VARCHAR(255) NOT NULL,
 	`Ort` VARCHAR(255) NOT NULL,
 	`Art` INTEGER NOT NULL,
 	`Start` DATETIME NOT NULL,
 	`Ende` DATETIME NOT NULL,
-	PRIMARY KEY(`id`)
+	`Uid` VARCHAR(255) NOT NULL,
+	PRIMARY KEY(`id`),
+	INDEX `ix_Termine_Ort` (`Ort`),
+	INDEX `ix_Termine_Art` (`Art`),
+	INDEX `ix_Termine_Start_Ende` (`Start`, `Ende`),
+	INDEX `ix_Termine_Ende` (`Ende`),
+	INDEX `ix_Termine_Uid` (`Uid`)
 );
 
 
@@ -59,7 +69,10 @@ CREATE TABLE IF NOT EXISTS `Teilnehmer` (
 	`id` INTEGER NOT NULL AUTO_INCREMENT UNIQUE,
 	`Kontakt` INTEGER NOT NULL,
 	`Termin` INTEGER NOT NULL,
-	PRIMARY KEY(`id`)
+	`istHaupt` BOOLEAN NOT NULL,
+	PRIMARY KEY(`id`),
+	INDEX `ix_Teilnehmer_Kontakt` (`Kontakt`),
+	INDEX `ix_Teilnehmer_Termin` (`Termin`)
 );
 
 
@@ -75,7 +88,9 @@ CREATE TABLE IF NOT EXISTS `Anhang` (
 	`id` INTEGER NOT NULL AUTO_INCREMENT UNIQUE,
 	`Protokoll` INTEGER NOT NULL,
 	`Medium` INTEGER NOT NULL,
-	PRIMARY KEY(`id`)
+	PRIMARY KEY(`id`),
+	INDEX `ix_Anhang_Protokoll` (`Protokoll`),
+	INDEX `ix_Anhang_Medium` (`Medium`)
 );
 
 
@@ -90,9 +105,13 @@ CREATE TABLE IF NOT EXISTS `Produkt` (
 CREATE TABLE IF NOT EXISTS `Auftrag` (
 	`id` INTEGER NOT NULL AUTO_INCREMENT UNIQUE,
 	`Bezeichnung` VARCHAR(255) NOT NULL,
-	`wichtigkeit` INTEGER NOT NULL,
+	`wichtigkeit` INTEGER,
 	`Kontakt` INTEGER NOT NULL,
-	PRIMARY KEY(`id`)
+	`terminid` INTEGER,
+	PRIMARY KEY(`id`),
+	INDEX `ix_Auftrag_wichtigkeit` (`wichtigkeit`),
+	INDEX `ix_Auftrag_Kontakt` (`Kontakt`),
+	INDEX `ix_Auftrag_terminid` (`terminid`)
 );
 
 
@@ -100,7 +119,9 @@ CREATE TABLE IF NOT EXISTS `Auftragsposition` (
 	`id` INTEGER NOT NULL AUTO_INCREMENT UNIQUE,
 	`Auftrag` INTEGER NOT NULL,
 	`Produkt` INTEGER NOT NULL,
-	PRIMARY KEY(`id`)
+	PRIMARY KEY(`id`),
+	INDEX `ix_Auftragsposition_Auftrag` (`Auftrag`),
+	INDEX `ix_Auftragsposition_Produkt` (`Produkt`)
 );
 
 
@@ -116,9 +137,12 @@ CREATE TABLE IF NOT EXISTS `Kontakt` (
 	`E-Mail` VARCHAR(255) NOT NULL,
 	`Telefonnummer` VARCHAR(255) NOT NULL,
 	`Rolle` VARCHAR(255) NOT NULL,
-	`Referenz` INTEGER NOT NULL,
+	`PersonId` INTEGER,
+	`UnternehmenId` INTEGER,
 	`RefTyp` VARCHAR(255) NOT NULL,
-	PRIMARY KEY(`id`)
+	PRIMARY KEY(`id`),
+	INDEX `ix_Kontakt_PersonId` (`PersonId`),
+	INDEX `ix_Kontakt_UnternehmenId` (`UnternehmenId`)
 );
 
 
@@ -147,10 +171,10 @@ ALTER TABLE `Unternehmen`
 ADD FOREIGN KEY(`Adresse`) REFERENCES `Adresse`(`id`)
 ON UPDATE NO ACTION ON DELETE NO ACTION;
 ALTER TABLE `Kontakt`
-ADD FOREIGN KEY(`Referenz`) REFERENCES `Unternehmen`(`id`)
+ADD FOREIGN KEY(`UnternehmenId`) REFERENCES `Unternehmen`(`id`)
 ON UPDATE NO ACTION ON DELETE NO ACTION;
 ALTER TABLE `Kontakt`
-ADD FOREIGN KEY(`Referenz`) REFERENCES `Person`(`id`)
+ADD FOREIGN KEY(`PersonId`) REFERENCES `Person`(`id`)
 ON UPDATE NO ACTION ON DELETE NO ACTION;
 ALTER TABLE `Auftrag`
 ADD FOREIGN KEY(`Kontakt`) REFERENCES `Kontakt`(`id`)
@@ -158,6 +182,9 @@ ON UPDATE NO ACTION ON DELETE NO ACTION;
 ALTER TABLE `Auftrag`
 ADD FOREIGN KEY(`wichtigkeit`) REFERENCES `Wichtigkeit`(`id`)
 ON UPDATE NO ACTION ON DELETE NO ACTION;
+ALTER TABLE `Auftrag`
+ADD FOREIGN KEY(`terminid`) REFERENCES `Termine`(`id`)
+ON UPDATE NO ACTION ON DELETE NO ACTION;
 ALTER TABLE `Auftragsposition`
 ADD FOREIGN KEY(`Auftrag`) REFERENCES `Auftrag`(`id`)
 ON UPDATE NO ACTION ON DELETE NO ACTION;